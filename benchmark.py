@@ -0,0 +1,384 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.io as pio
+import plotly.tools
+
+from chart_render import top_with_others
+from crime_charts import crime_regions_figure, district_rank_figure, profile_figure, top_crimes_figure
+from crime_data import COUNT, CRIME_CSV, CrimeCube, CrimeStore, _read_crime_csv, build_store
+from data_loader import MBTI_CSV, SUBWAY_CSV, SUBWAY_DTYPES, _read_mbti_csv, _read_subway_csv
+from figure_cache import cached_figure
+from mbti_charts import axis_figure, country_figure, similar_figure
+from mbti_data import MbtiMatrix
+from subway_charts import day_type_figure, rank_figure, trend_figure
+from subway_data import StationRanking, TrendRollups, build_rollup
+from tour_catalog import PLACES_CSV
+from tour_distance import haversine_matrix
+from tour_route import nearest_neighbour, optimize_route, route_length, split_days
+
+# 페이지 데이터 경로 벤치마크 — 브라우저 없이 각 페이지가 부르는 적재·조회·집계·그림 생성만 잰다.
+# 그림은 페이지와 같은 *_charts 모듈 함수로 만들고, 캐시에 없을 때처럼 JSON 직렬화까지 포함해 잰다.
+#   python benchmark.py [--only subway crime] [--repeat 20] [--output bench.json] [--baseline old.json]
+# 결과는 커밋끼리 diff할 수 있도록 시각 없이 키 순서를 고정한 JSON으로 출력한다.
+
+# 합성 데이터 배율·크기 (MBTI는 국가 간 거리 행렬이 n² x 16이라 10배까지만)
+SUBWAY_SCALES = (1, 10, 100)
+# 추세 롤업은 적재 시점에 월별로 한 번 만드는 작업이라 (역 수에 비례해 느림) 실제 데이터로만
+ROLLUP_SCALES = (1,)
+MBTI_SCALES = (1, 10)
+POI_COUNTS = (None, 1000)  # None은 실제 관광지 목록
+CRIME_YEARS = 5
+SEED = 0
+
+# 적재·색인 생성처럼 한 번에 수백 ms~수 초 걸리는 항목의 반복 횟수 상한
+BUILD_REPEAT = 5
+
+# 서울 시내 위도·경도 범위 (합성 관광지)
+SEOUL_BBOX = (37.45, 126.80, 37.70, 127.18)
+
+
+# ===== 측정 =====
+def measure(fn, repeat):
+    """한 번 예열한 뒤 repeat번 잰 지연 시간(ms)의 p50/p95와, 별도 1회 실행의 최대 할당 메모리(KiB)."""
+    fn()  # 첫 호출의 임포트·지연 초기화 비용은 빼고 잰다
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    # tracemalloc은 실행을 느리게 하므로 시간 측정과 따로 한 번 더 돌린다 (numpy 배열 할당도 집계됨)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "repeat": repeat,
+        "p50_ms": round(float(np.percentile(samples, 50)), 3),
+        "p95_ms": round(float(np.percentile(samples, 95)), 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def _case(name, dataset, size, fn, build=False, cost=None):
+    # build=True는 무거운 적재·색인 생성 (반복 횟수를 BUILD_REPEAT로 제한)
+    # cost는 결과의 품질(예: 경로 길이)을 돌려주는 함수 — 시간 예산에 묶인 항목은 지연 시간 대신 이 값을 비교한다
+    return {"case": name, "dataset": dataset, "size": int(size), "fn": fn, "build": build, "cost": cost}
+
+
+def _figure_json(fig):
+    # 그림 캐시와 같은 직렬화 경로까지 포함해 잰다
+    return pio.to_json(fig, validate=False)
+
+
+# ===== 지하철: 역 순위 =====
+def scale_subway(df, factor, rng):
+    """역 이름에 복제 번호를 붙이고 승하차 수를 흔들어 (날짜, 노선)마다 역 수를 factor배로 늘립니다."""
+    if factor == 1:
+        return df
+    stations = df["역명"].astype(str)
+    parts = []
+    for k in range(factor):
+        noise = rng.uniform(0.5, 1.5, size=len(df))
+        parts.append(pd.DataFrame({
+            "사용일자": df["사용일자"],
+            "노선명": df["노선명"].astype(str),
+            "역명": stations if k == 0 else stations + f"#{k}",
+            "승차총승객수": (df["승차총승객수"] * noise).astype("int32"),
+            "하차총승객수": (df["하차총승객수"] * noise).astype("int32"),
+        }))
+    return pd.concat(parts, ignore_index=True).astype(SUBWAY_DTYPES)
+
+
+def subway_cases(rng):
+    base = _read_subway_csv(SUBWAY_CSV)
+    cases = []
+    for factor in SUBWAY_SCALES:
+        df = scale_subway(base, factor, rng)
+        ranking = StationRanking(df)
+        date = ranking.dates[-1]
+        # 역이 가장 많은 노선 (페이지에서 가장 무거운 선택)
+        line = df[df["사용일자"] == date]["노선명"].astype(str).value_counts().index[0]
+
+        def rank_view(ranking=ranking, date=date, line=line):
+            plot_df = top_with_others(ranking.lookup(date, line)[["역명", "총승객"]], "역명", "총승객")
+            return _figure_json(rank_figure(plot_df, date, line))
+
+        def rank_view_cached(ranking=ranking, date=date, line=line, factor=factor):
+            # 같은 선택을 다시 그릴 때: st.plotly_chart처럼 캐시된 그림 사전을 검증한 뒤 JSON으로 보낸다
+            plot_df = top_with_others(ranking.lookup(date, line)[["역명", "총승객"]], "역명", "총승객")
+            spec = cached_figure("bench/subway/rank", (date, line), factor, lambda: rank_figure(plot_df, date, line))
+            return pio.to_json(plotly.tools.return_figure_from_figure_or_data(spec, validate_figure=True), validate=False)
+
+        dataset = f"jijonsik.csv x{factor}"
+        cases += [
+            _case("subway.ranking_build", dataset, len(df), lambda df=df: StationRanking(df), build=True),
+            _case("subway.lookup", dataset, len(df), lambda r=ranking, d=date, l=line: r.lookup(d, l)),
+            _case("subway.rank_figure", dataset, len(df), rank_view),
+            _case("subway.rank_figure_hit", dataset, len(df), rank_view_cached),
+        ]
+        if factor in ROLLUP_SCALES:
+            rollup = build_rollup(df)
+            trends = TrendRollups(rollup)
+            # 일별 점이 가장 많은 노선
+            name = max(trends.names["노선"], key=lambda n: len(trends.series("노선", n, "D")))
+
+            def trend_view(trends=trends, name=name):
+                _figure_json(trend_figure(trends.series("노선", name, "D"), name, "D", 7))
+                return _figure_json(day_type_figure(trends.day_type_split("노선", name), name))
+
+            cases += [
+                _case("subway.rollup_build", dataset, len(df), lambda df=df: build_rollup(df), build=True),
+                _case("subway.trend_index", dataset, len(rollup), lambda r=rollup: TrendRollups(r), build=True),
+                _case("subway.trend_figure", dataset, len(rollup), trend_view),
+            ]
+    return cases
+
+
+# ===== 범죄: Top-N / 순위 / 지역 비교 =====
+def write_crime_years(df, out_dir, years, rng):
+    """실제 한 해치 표의 건수를 해마다 흔들어 연도별 CSV(이름 끝 YYYY1231)로 씁니다."""
+    sources = {}
+    regions = df.columns.drop(["범죄대분류", "범죄중분류"])
+    for year in years:
+        yearly = df.copy()
+        factor = rng.uniform(0.8, 1.2, size=(len(df), len(regions)))
+        yearly[regions] = np.rint(df[regions].to_numpy() * factor).astype("int32")
+        path = os.path.join(out_dir, f"범죄_{year}1231.csv")
+        yearly.to_csv(path, index=False)
+        sources[year] = path
+    return sources
+
+
+def crime_query_cases(cube, dataset, size):
+    district = cube.districts[int(cube.district_orders[COUNT][0])]
+    crime_type = cube.crime_types[int(np.argmax(cube.crime_totals))]
+
+    def top_n():
+        return _figure_json(top_crimes_figure(cube.top_crimes(district, 10, COUNT), district, 10, COUNT))
+
+    def ranking():
+        board = top_with_others(cube.district_ranking(COUNT), "지역", "총_범죄_건수", 10)
+        return _figure_json(district_rank_figure(board, district, COUNT, "Top 10"))
+
+    def similar():
+        neighbours = cube.similar_districts(district, 10)
+        profile = cube.crime_profile([district] + neighbours["지역"].head(3).tolist())
+        return _figure_json(profile_figure(profile, district, 10))
+
+    def compare():
+        regions = cube.regions_for(crime_type, 20, COUNT)
+        return _figure_json(crime_regions_figure(regions, crime_type, "전국", district, COUNT))
+
+    return [
+        _case("crime.top_n", dataset, size, top_n),
+        _case("crime.ranking", dataset, size, ranking),
+        _case("crime.similar", dataset, size, similar),
+        _case("crime.compare", dataset, size, compare),
+    ]
+
+
+def crime_cases(rng, work_dir):
+    df = _read_crime_csv(CRIME_CSV)
+    size = df.shape[0] * (df.shape[1] - 2)
+    cases = [_case("crime.cube_build", "1 year", size, lambda: CrimeCube(df), build=True)]
+    cases += crime_query_cases(CrimeCube(df), "1 year", size)
+
+    # 여러 해: 연도별 CSV → (연도, 유형, 지역) 저장소 → 연도별 큐브
+    source_dir = os.path.join(work_dir, "crime")
+    store_dir = os.path.join(work_dir, "crime_store")
+    os.makedirs(source_dir)
+    sources = write_crime_years(df, source_dir, range(2024 - CRIME_YEARS, 2024), rng)
+    dataset = f"{CRIME_YEARS} years"
+
+    def store_build():
+        shutil.rmtree(store_dir, ignore_errors=True)  # 서명이 같으면 건너뛰므로 매번 처음부터
+        build_store(sources, store_dir)
+
+    store_build()
+    store = CrimeStore(store_dir)
+    year = store.years[-1]
+    district = store.districts[0]
+
+    def yoy():
+        store.district_yoy(year, district)
+        return store.district_series(district)
+
+    cases += [
+        _case("crime.store_build", dataset, size * CRIME_YEARS, store_build, build=True),
+        _case("crime.year_cube", dataset, size * CRIME_YEARS, lambda: CrimeCube(store.year_frame(year)), build=True),
+        _case("crime.yoy", dataset, size * CRIME_YEARS, yoy),
+    ]
+    cases += crime_query_cases(CrimeCube(store.year_frame(year)), dataset, size * CRIME_YEARS)
+    return cases
+
+
+# ===== MBTI: 국가별 보기 =====
+def scale_mbti(df, factor, rng):
+    """실제 국가 뒤에 디리클레 분포로 뽑은 합성 국가를 붙여 국가 수를 factor배로 늘립니다."""
+    if factor == 1:
+        return df
+    types = [c for c in df.columns if c != "Country"]
+    extra = len(df) * (factor - 1)
+    values = rng.dirichlet(df[types].mean().to_numpy(dtype=np.float64) * 100, size=extra).astype(np.float32)
+    synthetic = pd.DataFrame(values, columns=types)
+    synthetic.insert(0, "Country", [f"Country {i}" for i in range(extra)])
+    return pd.concat([df, synthetic], ignore_index=True)
+
+
+def mbti_cases(rng):
+    base = _read_mbti_csv(MBTI_CSV)
+    cases = []
+    for factor in MBTI_SCALES:
+        df = scale_mbti(base, factor, rng)
+        matrix = MbtiMatrix(df)
+        country = matrix.countries[0]
+
+        def country_view(matrix=matrix, country=country):
+            profile = matrix.country_profile(country)
+            _figure_json(country_figure(profile, country))
+            _figure_json(axis_figure(matrix.axis_profile(country), country))
+            similar = matrix.similar_countries(country, 10)
+            return _figure_json(similar_figure(matrix, [country] + similar["Country"].head(3).tolist(), profile["MBTI"]))
+
+        def leaderboards(matrix=matrix):
+            matrix.type_leaderboard(matrix.types[0], 10)
+            return matrix.axis_leaderboard("E", 10)
+
+        dataset = f"countriesMBTI_16types.csv x{factor}"
+        cases += [
+            _case("mbti.matrix_build", dataset, len(df), lambda df=df: MbtiMatrix(df), build=True),
+            _case("mbti.country_view", dataset, len(df), country_view),
+            _case("mbti.leaderboards", dataset, len(df), leaderboards),
+            _case("mbti.clusters", dataset, len(df), lambda matrix=matrix: matrix.clusters(5)),
+        ]
+    return cases
+
+
+# ===== 관광: 일정 나누기와 방문 순서 =====
+def random_places(n, rng):
+    south, west, north, east = SEOUL_BBOX
+    return rng.uniform(south, north, size=n), rng.uniform(west, east, size=n)
+
+
+def tour_cases(rng):
+    places = pd.read_csv(PLACES_CSV)
+    cases = []
+    for count in POI_COUNTS:
+        if count is None:
+            lat, lon = places["위도"].to_numpy(dtype=float), places["경도"].to_numpy(dtype=float)
+            dataset = "seoul_places.csv"
+        else:
+            lat, lon = random_places(count, rng)
+            dataset = f"{count} random POIs"
+        dist = haversine_matrix(lat, lon)
+        days = max(1, len(dist) // 200) if count else 3
+        everything = np.arange(len(dist))
+        cases += [
+            _case("tour.distance_matrix", dataset, len(dist), lambda lat=lat, lon=lon: haversine_matrix(lat, lon)),
+            _case("tour.split_days", dataset, len(dist), lambda dist=dist, days=days: split_days(dist, days)),
+            # 개선 전 초기 경로 — optimize_route의 cost와 비교할 기준
+            _case("tour.nearest_neighbour", dataset, len(dist), lambda dist=dist: nearest_neighbour(dist),
+                  cost=lambda dist=dist: route_length(nearest_neighbour(dist), dist)),
+            # 큰 입력은 시간 예산(TIME_BUDGET)까지 개선을 계속하므로 지연 시간은 예산에 묶인다 — cost(경로 길이)로 비교
+            _case("tour.optimize_route", dataset, len(dist),
+                  lambda dist=dist, idx=everything: optimize_route(idx, dist), build=len(dist) > 100,
+                  cost=lambda dist=dist, idx=everything: route_length(optimize_route(idx, dist), dist)),
+        ]
+    return cases
+
+
+SUITES = {
+    "subway": lambda rng, work_dir: subway_cases(rng),
+    "crime": crime_cases,
+    "mbti": lambda rng, work_dir: mbti_cases(rng),
+    "tour": lambda rng, work_dir: tour_cases(rng),
+}
+
+
+# ===== 실행과 보고 =====
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(suites, repeat):
+    """선택한 묶음의 항목을 차례로 재 결과 목록을 돌려줍니다 (합성 파일은 임시 폴더에만 쓴다)."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench-") as work_dir:
+        for suite in suites:
+            rng = np.random.default_rng(SEED)  # 묶음마다 같은 합성 데이터
+            for case in SUITES[suite](rng, work_dir):
+                n = min(repeat, BUILD_REPEAT) if case["build"] else repeat
+                stats = measure(case["fn"], n)
+                if case["cost"] is not None:
+                    stats["cost"] = round(float(case["cost"]()), 3)
+                results.append({"case": case["case"], "dataset": case["dataset"], "size": case["size"], **stats})
+                print(f"{case['case']:<22} {case['dataset']:<34} p50 {stats['p50_ms']:>10.3f} ms"
+                      f"  p95 {stats['p95_ms']:>10.3f} ms  peak {stats['peak_kib']:>12.1f} KiB"
+                      + (f"  cost {stats['cost']:.3f}" if "cost" in stats else ""), file=sys.stderr)
+    return results
+
+
+def report(results):
+    return {
+        "environment": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "plotly": plotly.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline, results):
+    """이전 결과 파일과 항목별 p50/최대 메모리 (있으면 cost) 변화율을 표로 출력합니다."""
+    old = {(r["case"], r["dataset"]): r for r in baseline["results"]}
+    print(f"{'case':<22} {'dataset':<34} {'p50':>9} {'peak':>9} {'cost':>9}", file=sys.stderr)
+    for r in results:
+        before = old.get((r["case"], r["dataset"]))
+        if before is None:
+            continue
+        p50 = r["p50_ms"] / before["p50_ms"] - 1 if before["p50_ms"] else 0.0
+        peak = r["peak_kib"] / before["peak_kib"] - 1 if before["peak_kib"] else 0.0
+        cost = f"{r['cost'] / before['cost'] - 1:>+9.1%}" if before.get("cost") and "cost" in r else ""
+        print(f"{r['case']:<22} {r['dataset']:<34} {p50:>+9.1%} {peak:>+9.1%} {cost}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="페이지 데이터 경로 벤치마크 (p50/p95 지연 시간, 최대 메모리)")
+    parser.add_argument("--only", nargs="+", choices=list(SUITES), default=list(SUITES), help="실행할 묶음")
+    parser.add_argument("--repeat", type=int, default=20, help="항목별 반복 횟수 (적재·색인 생성은 최대 5회)")
+    parser.add_argument("--output", help="결과 JSON 파일 (없으면 표준 출력)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON 파일")
+    args = parser.parse_args()
+
+    results = run(args.only, max(1, args.repeat))
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            compare(json.load(f), results)
+    text = json.dumps(report(results), ensure_ascii=False, indent=1, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
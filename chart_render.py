@@ -0,0 +1,33 @@
+import pandas as pd
+
+# 막대 그래프 기본 표시 개수 (나머지는 '기타' 막대 하나로), 긴 꼬리 페이지 크기
+RENDER_TOP_N = 20
+PAGE_SIZE = 25
+
+# 선·점 그래프 점 개수가 이보다 많으면 WebGL(scattergl)로 그린다
+WEBGL_POINTS = 1000
+
+OTHERS_LABEL = "기타"
+
+
+def top_with_others(df, label, value, n=RENDER_TOP_N, how="sum", others_label=OTHERS_LABEL):
+    """내림차순 정렬된 표의 상위 n행에, 나머지를 합계(또는 평균) 한 행으로 묶어 붙입니다."""
+    if len(df) <= n:
+        return df
+    rest = df.iloc[n:]
+    agg = rest[value].sum() if how == "sum" else rest[value].mean()
+    kind = "합계" if how == "sum" else "평균"
+    others = pd.DataFrame({label: [f"{others_label} ({len(rest)}곳 {kind})"], value: [agg]})
+    return pd.concat([df.iloc[:n], others], ignore_index=True)
+
+
+def page_slice(df, page, page_size=PAGE_SIZE):
+    """긴 표를 페이지 단위로 잘라 (해당 페이지, 전체 페이지 수)를 돌려줍니다 (페이지는 1부터)."""
+    pages = max(1, -(-len(df) // page_size))
+    page = min(max(1, int(page)), pages)
+    return df.iloc[(page - 1) * page_size:page * page_size], pages
+
+
+def render_mode(points, threshold=WEBGL_POINTS):
+    """px.line / px.scatter의 render_mode — 점이 많으면 'webgl', 아니면 'svg'."""
+    return "webgl" if points > threshold else "svg"
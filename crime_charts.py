@@ -0,0 +1,170 @@
+import plotly.express as px
+
+from crime_data import METRIC_LABELS
+
+# 범죄 분석 페이지 그림 — 페이지는 cached_figure로 감싸 부르고, benchmark.py도 같은 함수를 잰다
+
+
+def top_crimes_figure(top_n_crime, district, top_n, metric):
+    """선택 지역의 범죄 유형 Top N 가로 막대 그래프."""
+    fig_topn = px.bar(
+        top_n_crime,
+        x=district,
+        y='범죄중분류',
+        orientation='h',
+        title=f"🥇 **{district}** 범죄 {metric} Top {top_n} 유형",
+        labels={district: METRIC_LABELS[metric], '범죄중분류': '범죄 유형'},
+        hover_data={'z점수': ':.2f'},
+        color=district,
+        color_continuous_scale=px.colors.sequential.Plotly3,
+    )
+    fig_topn.update_layout(yaxis={'categoryorder': 'total ascending'}, height=450)
+    return fig_topn
+
+
+def yearly_total_figure(series_df, district):
+    """연도별 총 범죄 건수 선 그래프."""
+    fig_years = px.line(
+        series_df,
+        x='연도',
+        y='총_범죄_건수',
+        markers=True,
+        title=f"{district} 연도별 총 범죄 건수",
+        labels={'총_범죄_건수': '총 범죄 건수', '연도': '연도'},
+    )
+    fig_years.update_xaxes(dtick=1)
+    return fig_years
+
+
+def yearly_growth_figure(series_df, district):
+    """전년 대비 증감률 막대 그래프 (전년 자료가 없는 해는 뺀다)."""
+    growth_df = series_df.dropna(subset=['증감률'])
+    fig_growth = px.bar(
+        growth_df,
+        x='연도',
+        y='증감률',
+        title=f"{district} 전년 대비 증감률",
+        color='증감률',
+        color_continuous_scale=px.colors.diverging.RdBu_r,
+        color_continuous_midpoint=0,
+        labels={'증감률': '증감률', '연도': '연도'},
+        hover_data={'증감': ':,.0f'},
+    )
+    fig_growth.update_layout(yaxis_tickformat='.0%')
+    fig_growth.update_xaxes(dtick=1)
+    return fig_growth
+
+
+def profile_figure(profile, district, top_n):
+    """여러 지역의 범죄 유형 구성비 비교 (district 기준 상위 top_n 유형)."""
+    profile = profile.loc[profile[district].nlargest(top_n).index]
+    profile_long = profile.reset_index(names='범죄중분류').melt(id_vars='범죄중분류', var_name='지역', value_name='구성비')
+    fig_profile = px.bar(
+        profile_long,
+        x='구성비',
+        y='범죄중분류',
+        color='지역',
+        barmode='group',
+        orientation='h',
+        title=f"범죄 유형 구성비 비교 (Top {top_n} 유형)",
+        labels={'구성비': '구성비', '범죄중분류': '범죄 유형'},
+    )
+    fig_profile.update_layout(yaxis={'categoryorder': 'total ascending'}, xaxis_tickformat='.0%', height=max(450, top_n * 35))
+    return fig_profile
+
+
+def district_rank_figure(rank_plot_df, district, rank_metric, title):
+    """지역별 총 범죄 건수 순위 (선택 지역 강조)."""
+    fig_rank = px.bar(
+        rank_plot_df,
+        x='총_범죄_건수',
+        y='지역',
+        orientation='h',
+        title=title,
+        color='지역',
+        color_discrete_map={district: 'red'}, # 선택한 지역 강조
+        labels={'총_범죄_건수': f"총 {METRIC_LABELS[rank_metric]}", '지역': '지역'},
+    )
+    fig_rank.update_layout(yaxis={'categoryorder': 'total ascending'}, height=max(500, len(rank_plot_df) * 30))
+    return fig_rank
+
+
+def province_rank_figure(province_rank_df, province, rank_metric):
+    """시도별 총 범죄 건수 순위 (선택 지역이 속한 시도 강조)."""
+    fig_province = px.bar(
+        province_rank_df,
+        x='총_범죄_건수',
+        y='시도',
+        orientation='h',
+        title=f"시도별 총 범죄 건수({rank_metric}) 순위",
+        color='시도',
+        color_discrete_map={province: 'red'},
+        labels={'총_범죄_건수': f"총 {METRIC_LABELS[rank_metric]}", '시도': '시도'},
+    )
+    fig_province.update_layout(yaxis={'categoryorder': 'total ascending'}, height=max(450, len(province_rank_df) * 28), showlegend=False)
+    return fig_province
+
+
+def province_districts_figure(province_districts, province, district, rank_metric):
+    """시도 안 시군구별 총 범죄 건수 순위 (선택 지역 강조)."""
+    fig_local = px.bar(
+        province_districts,
+        x='총_범죄_건수',
+        y='시군구',
+        orientation='h',
+        title=f"{province} 시군구별 총 범죄 건수({rank_metric}) 순위",
+        color='지역',
+        color_discrete_map={district: 'red'},
+        labels={'총_범죄_건수': f"총 {METRIC_LABELS[rank_metric]}", '시군구': '시군구'},
+    )
+    fig_local.update_layout(yaxis={'categoryorder': 'total ascending'}, height=max(400, len(province_districts) * 25), showlegend=False)
+    return fig_local
+
+
+def province_crimes_figure(province_crimes, province, top_n, metric):
+    """시도 전체의 범죄 유형 Top N."""
+    fig_province_crime = px.bar(
+        province_crimes,
+        x=province,
+        y='범죄중분류',
+        orientation='h',
+        title=f"{province} 범죄 {metric} Top {top_n} 유형",
+        labels={province: METRIC_LABELS[metric], '범죄중분류': '범죄 유형'},
+        color=province,
+        color_continuous_scale=px.colors.sequential.Plotly3,
+    )
+    fig_province_crime.update_layout(yaxis={'categoryorder': 'total ascending'}, height=450)
+    return fig_province_crime
+
+
+def major_detail_figure(detail_grouped, major_category, district, metric):
+    """대분류 안 중분류별 비교."""
+    fig_detail = px.bar(
+        detail_grouped,
+        x=district,
+        y='범죄중분류',
+        orientation='h',
+        title=f"'{major_category}' 대분류 내 중분류별 {metric} 비교",
+        labels={district: METRIC_LABELS[metric], '범죄중분류': '범죄 유형'},
+        color=district,
+        color_continuous_scale=px.colors.sequential.Agsunset,
+    )
+    fig_detail.update_layout(yaxis={'categoryorder': 'total ascending'}, height=max(400, len(detail_grouped) * 35))
+    return fig_detail
+
+
+def crime_regions_figure(compare_df, crime_type, scope, district, metric):
+    """한 범죄 유형의 지역별 비교 (scope 안 Top 20, 선택 지역 강조)."""
+    fig_comp = px.bar(
+        compare_df,
+        x='발생_건수',
+        y='지역',
+        orientation='h',
+        title=f"**{crime_type}** {metric} 지역별 비교 ({scope} Top 20)",
+        color='지역',
+        color_discrete_map={district: '#0077b6'},
+        labels={'발생_건수': METRIC_LABELS[metric], '지역': '지역'},
+        hover_data={'z점수': ':.2f'},
+    )
+    fig_comp.update_layout(yaxis={'categoryorder': 'total ascending'}, height=600)
+    return fig_comp
@@ -0,0 +1,499 @@
+import glob
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import file_stamp, read_csv_once, read_snapshot, temp_store_dir
+
+CRIME_CSV = "경찰청_범죄 발생 지역별 통계_20231231.csv"
+KEY_COLUMNS = ["범죄대분류", "범죄중분류"]
+
+# 연도별 CSV를 넣어 두는 폴더 (파일 이름 끝의 YYYYMMDD 또는 YYYY로 연도 판별)와, 연도 x 유형 x 지역 저장소
+CRIME_DIR = os.path.join("data", "crime")
+CRIME_STORE = "crime_store"
+
+# 선택: 지역별 인구·면적 표 (열: 지역, 인구, 면적_km2 — 지역 이름은 범죄 CSV의 열 이름과 같게)
+POPULATION_CSV = "지역별_인구_면적.csv"
+
+
+def _read_crime_csv(file_path):
+    """인코딩을 판별해 CSV를 한 번만 파싱하고, 지역 열은 int32로 읽습니다."""
+    header = read_csv_once(file_path, nrows=0).columns
+    dtypes = {col: "str" if col in KEY_COLUMNS else "int32" for col in header}
+    try:
+        return read_csv_once(file_path, dtype=dtypes)
+    except ValueError:
+        # 빈칸이나 숫자가 아닌 값이 섞인 파일만 느린 경로로 변환 (비정상 값은 0건으로 처리)
+        df = read_csv_once(file_path, dtype={col: "str" for col in KEY_COLUMNS})
+        col_to_convert = df.columns.drop(KEY_COLUMNS)
+        df[col_to_convert] = df[col_to_convert].apply(pd.to_numeric, errors='coerce').fillna(0).astype("int32")
+        return df
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
+# ===== (대분류, 중분류) x 지역 범죄 큐브 =====
+COUNT = "건수"
+PER_100K = "인구 10만명당"
+PER_KM2 = "면적 km²당"
+LQ = "입지계수(LQ)"
+
+# 지표별 그래프 축 이름
+METRIC_LABELS = {
+    COUNT: "발생 건수 (건)",
+    PER_100K: "인구 10만명당 발생 건수",
+    PER_KM2: "km²당 발생 건수",
+    LQ: "입지계수 (전국 구성비 대비)",
+}
+
+
+def _orders(values):
+    """NaN은 맨 뒤로 가도록 내림차순 정렬 순서 (동점은 원본 순서 유지)."""
+    return _readonly(np.argsort(np.where(np.isnan(values), np.inf, -values), axis=-1, kind="stable"))
+
+
+def _build_metrics(counts, population=None, area=None):
+    """(유형 x 지역) 건수로 지표별 값과, 합계로 순위를 매길 수 있는 지표의 지역 합계를 계산합니다."""
+    totals = counts.sum(axis=0)
+    crime_totals = counts.sum(axis=1)
+    metrics, sums = {COUNT: counts}, {COUNT: totals}
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for name, base, scale in ((PER_100K, population, 1e5), (PER_KM2, area, 1.0)):
+            if base is not None:
+                base = np.where(base > 0, base, np.nan)
+                metrics[name] = counts / base * scale
+                sums[name] = totals / base * scale
+        # 입지계수 = 지역 구성비 / 전국 구성비 (지역 합계는 의미가 없어 순위 지표에서 제외)
+        share = counts / np.where(totals > 0, totals, np.nan)
+        national_share = crime_totals / max(crime_totals.sum(), 1)
+        metrics[LQ] = share / national_share[:, None]
+    for values in (*metrics.values(), *sums.values()):
+        _readonly(values)
+    return metrics, sums
+
+
+# ===== 시도 / 시군구 계층 =====
+# 열 이름 앞부분 → 시도 (긴 접두어부터 비교)
+PROVINCE_PREFIXES = [
+    ("경기도", "경기"), ("강원도", "강원"), ("세종", "세종"),
+    ("서울", "서울"), ("부산", "부산"), ("대구", "대구"), ("인천", "인천"),
+    ("광주", "광주"), ("대전", "대전"), ("울산", "울산"),
+    ("충북", "충북"), ("충남", "충남"), ("전북", "전북"), ("전남", "전남"),
+    ("경북", "경북"), ("경남", "경남"), ("제주", "제주"), ("외국", "외국"),
+]
+OTHER_PROVINCE = "기타"
+
+
+def split_region(name):
+    """'서울종로구' → ('서울', '종로구'), '세종시' → ('세종', '세종시')."""
+    for prefix, province in PROVINCE_PREFIXES:
+        if name.startswith(prefix):
+            local = name[len(prefix):]
+            return province, local if len(local) > 1 else name
+    return OTHER_PROVINCE, name
+
+
+# ===== 지역 간 범죄 양상 유사도 =====
+# 지역마다 미리 저장해 두는 가장 비슷한 지역 수
+NEIGHBOURS = 30
+
+
+def _top_neighbours(vectors, k=NEIGHBOURS, block=512):
+    """단위 벡터(지역 x 유형)의 코사인 유사도로 지역마다 가장 비슷한 k곳과 유사도를 구합니다.
+
+    전체 유사도 행렬을 한꺼번에 만들지 않고 block개 지역씩 계산해 메모리를 일정하게 유지합니다.
+    """
+    n = len(vectors)
+    k = min(k, n - 1)
+    neighbours = np.empty((n, k), dtype=np.int64)
+    scores = np.empty((n, k), dtype=np.float64)
+    for start in range(0, n, block):
+        sim = vectors[start:start + block] @ vectors.T
+        rows = np.arange(sim.shape[0])
+        sim[rows, start + rows] = -np.inf  # 자기 자신 제외
+        top = np.argpartition(-sim, k - 1, axis=1)[:, :k] if k else np.empty((len(sim), 0), dtype=np.int64)
+        top_sim = np.take_along_axis(sim, top, axis=1)
+        order = np.argsort(-top_sim, axis=1, kind="stable")
+        neighbours[start:start + block] = np.take_along_axis(top, order, axis=1)
+        scores[start:start + block] = np.take_along_axis(top_sim, order, axis=1)
+    return _readonly(neighbours), _readonly(scores)
+
+
+def _zscores(values):
+    # 범죄 유형별로 지역 간 표준화 (분산이 0인 유형은 0)
+    mean = np.nanmean(values, axis=1, keepdims=True)
+    std = np.nanstd(values, axis=1, keepdims=True)
+    return np.divide(values - mean, std, out=np.zeros(values.shape), where=std > 0)
+
+
+class CrimeCube:
+    """범죄 건수를 (대분류, 중분류) x 지역 배열로 두고, 지표·합계·순위를 미리 계산해 둔 구조."""
+
+    def __init__(self, df, population=None):
+        grouped = df.groupby(KEY_COLUMNS, sort=False).sum()
+        self.districts = grouped.columns.tolist()
+        self.majors_of_row = grouped.index.get_level_values(0).to_numpy()
+        self.crime_types = grouped.index.get_level_values(1).tolist()
+        self.counts = _readonly(grouped.to_numpy(dtype=np.int64))
+
+        self.district_index = {d: i for i, d in enumerate(self.districts)}
+        self.crime_index = {c: i for i, c in enumerate(self.crime_types)}
+        self.major_rows = {
+            major: _readonly(np.flatnonzero(self.majors_of_row == major))
+            for major in pd.unique(self.majors_of_row)
+        }
+
+        # 합계
+        self.district_totals = _readonly(self.counts.sum(axis=0))
+        self.crime_totals = _readonly(self.counts.sum(axis=1))
+
+        # 지표별 (유형 x 지역) 값과 지역 합계
+        pop = area = None
+        if population is not None:
+            table = population.drop_duplicates("지역").set_index("지역").reindex(self.districts)
+            pop = table["인구"].to_numpy(dtype=np.float64)
+            area = table["면적_km2"].to_numpy(dtype=np.float64)
+        self.metrics, self.totals = _build_metrics(self.counts, pop, area)
+        self.metric_names = list(self.metrics)
+        self.zscores = {name: _readonly(_zscores(values)) for name, values in self.metrics.items()}
+
+        # 미리 정렬된 순위
+        self.district_orders = {name: _orders(total) for name, total in self.totals.items()}
+        self.district_ranks = {}
+        for name, order in self.district_orders.items():
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(1, len(order) + 1)
+            self.district_ranks[name] = _readonly(rank)
+        # crime_orders[m][:, d]: 지역 d의 유형 내림차순 / region_orders[m][c]: 유형 c의 지역 내림차순
+        self.crime_orders = {name: _orders(values.T).T for name, values in self.metrics.items()}
+        self.region_orders = {name: _orders(values) for name, values in self.metrics.items()}
+
+        self.district_rank = self.district_ranks[COUNT]
+
+        # 범죄 유형 구성비 벡터(단위 길이)로 비슷한 지역을 미리 찾아 둔다 (범죄가 없는 지역은 0 벡터)
+        profiles = self.counts.T.astype(np.float64)
+        norms = np.linalg.norm(profiles, axis=1, keepdims=True)
+        profiles = np.divide(profiles, norms, out=np.zeros_like(profiles), where=norms > 0)
+        self.neighbours, self.neighbour_scores = _top_neighbours(profiles)
+
+        # 시도 계층: 열 이름을 한 번만 분해하고 시도별 집계를 미리 만든다
+        parsed = [split_region(d) for d in self.districts]
+        self.local_names = [local for _, local in parsed]
+        self.provinces = list(dict.fromkeys(province for province, _ in parsed))
+        self.province_index = {p: i for i, p in enumerate(self.provinces)}
+        self.province_codes = _readonly(np.array([self.province_index[p] for p, _ in parsed], dtype=np.int64))
+        membership = np.zeros((len(self.districts), len(self.provinces)), dtype=np.int64)
+        membership[np.arange(len(self.districts)), self.province_codes] = 1
+
+        def province_sum(values):
+            # 시도 안에 값이 하나도 없으면 NaN (일부만 없으면 있는 값만 합산)
+            if values is None:
+                return None
+            known = ~np.isnan(values)
+            total = np.nan_to_num(values) @ membership
+            return np.where(known @ membership > 0, total, np.nan)
+
+        self.province_metrics, self.province_totals = _build_metrics(
+            _readonly(self.counts @ membership), province_sum(pop), province_sum(area)
+        )
+        self.province_orders = {name: _orders(total) for name, total in self.province_totals.items()}
+        # 시도 안 지역 순위: 전국 순위 순서를 시도별로 걸러 둔다
+        self.province_district_orders = {
+            name: {
+                p: _readonly(order[self.province_codes[order] == i])
+                for i, p in enumerate(self.provinces)
+            }
+            for name, order in self.district_orders.items()
+        }
+
+    def top_crimes(self, district, n=None, metric=COUNT):
+        """지역 하나의 범죄 유형별 지표값 (내림차순 상위 n개, 지역 간 z점수 포함)."""
+        d = self.district_index[district]
+        rows = self.crime_orders[metric][:n, d]
+        return pd.DataFrame({
+            "범죄중분류": [self.crime_types[r] for r in rows],
+            "범죄대분류": self.majors_of_row[rows],
+            district: self.metrics[metric][rows, d],
+            "z점수": self.zscores[metric][rows, d],
+        })
+
+    def district_ranking(self, metric=COUNT):
+        """전체 지역의 합계 지표 순위표."""
+        order = self.district_orders[metric]
+        return pd.DataFrame({
+            "지역": [self.districts[i] for i in order],
+            "총_범죄_건수": self.totals[metric][order],
+            "순위": np.arange(1, len(order) + 1),
+        })
+
+    def major_of(self, crime_type):
+        return self.majors_of_row[self.crime_index[crime_type]]
+
+    def major_detail(self, major, district, metric=COUNT):
+        """같은 대분류에 속한 중분류별 지표값 (지역 하나, 내림차순)."""
+        rows = self.major_rows[major]
+        d = self.district_index[district]
+        values = self.metrics[metric][rows, d]
+        order = np.argsort(np.where(np.isnan(values), np.inf, -values), kind="stable")
+        return pd.DataFrame({
+            "범죄중분류": [self.crime_types[r] for r in rows[order]],
+            district: values[order],
+        })
+
+    def regions_for(self, crime_type, n=None, metric=COUNT, province=None):
+        """범죄 유형 하나의 지역별 지표값 (내림차순 상위 n개, z점수 포함, 시도로 범위 제한 가능)."""
+        c = self.crime_index[crime_type]
+        cols = self.region_orders[metric][c]
+        if province is not None:
+            cols = cols[self.province_codes[cols] == self.province_index[province]]
+        cols = cols[:n]
+        return pd.DataFrame({
+            "지역": [self.districts[i] for i in cols],
+            "발생_건수": self.metrics[metric][c, cols],
+            "z점수": self.zscores[metric][c, cols],
+        })
+
+
+    def province_ranking(self, metric=COUNT):
+        """시도별 합계 지표 순위표."""
+        order = self.province_orders[metric]
+        return pd.DataFrame({
+            "시도": [self.provinces[i] for i in order],
+            "총_범죄_건수": self.province_totals[metric][order],
+            "순위": np.arange(1, len(order) + 1),
+        })
+
+    def province_districts(self, province, metric=COUNT):
+        """시도 안 시군구의 합계 지표 순위표 (시도 내 순위)."""
+        order = self.province_district_orders[metric][province]
+        return pd.DataFrame({
+            "지역": [self.districts[i] for i in order],
+            "시군구": [self.local_names[i] for i in order],
+            "총_범죄_건수": self.totals[metric][order],
+            "순위": np.arange(1, len(order) + 1),
+        })
+
+    def province_top_crimes(self, province, n=None, metric=COUNT):
+        """시도 하나의 범죄 유형별 지표값 (내림차순 상위 n개)."""
+        values = self.province_metrics[metric][:, self.province_index[province]]
+        rows = np.argsort(np.where(np.isnan(values), np.inf, -values), kind="stable")[:n]
+        return pd.DataFrame({
+            "범죄중분류": [self.crime_types[r] for r in rows],
+            "범죄대분류": self.majors_of_row[rows],
+            province: values[rows],
+        })
+
+
+    def similar_districts(self, district, n=10):
+        """범죄 유형 구성이 가장 비슷한 지역 (코사인 유사도 내림차순)."""
+        d = self.district_index[district]
+        cols = self.neighbours[d, :n]
+        return pd.DataFrame({
+            "지역": [self.districts[i] for i in cols],
+            "유사도": self.neighbour_scores[d, :n],
+        })
+
+    def crime_profile(self, districts):
+        """여러 지역의 범죄 유형 구성비 (유형 x 지역, 각 지역 합계 1)."""
+        cols = [self.district_index[d] for d in districts]
+        counts = self.counts[:, cols].astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            share = counts / counts.sum(axis=0)
+        return pd.DataFrame(np.nan_to_num(share), index=self.crime_types, columns=districts)
+
+
+def load_population(path=POPULATION_CSV):
+    """지역별 인구·면적 표 (지역, 인구, 면적_km2) — 파일이 없으면 None."""
+    if not os.path.exists(path):
+        return None
+    return read_csv_once(path, dtype={"지역": "str", "인구": "float64", "면적_km2": "float64"})
+
+
+# ===== 연도 x 유형 x 지역 저장소 =====
+def source_year(path):
+    """파일 이름 끝의 날짜(YYYYMMDD) 또는 연도(YYYY)로 자료 연도를 판별합니다."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    match = re.search(r"(\d{4})(?:\d{4})?$", stem)
+    return int(match.group(1)) if match else None
+
+
+def crime_source_files(source_dir=CRIME_DIR):
+    """연도 → CSV 경로 (같은 연도가 여럿이면 폴더 안 파일이 우선)."""
+    sources = {}
+    for path in [CRIME_CSV] + sorted(glob.glob(os.path.join(source_dir, "*.csv"))):
+        year = source_year(path)
+        if year is not None and os.path.exists(path):
+            sources[year] = path
+    return dict(sorted(sources.items()))
+
+
+def _store_paths(store_dir):
+    return (
+        os.path.join(store_dir, "meta.json"),
+        os.path.join(store_dir, "counts.npy"),
+        os.path.join(store_dir, "summary.npz"),
+    )
+
+
+def _yoy(totals, years, present=None):
+    # 전년 대비 증감과 증감률 (첫해·바로 앞 연도 자료가 없는 해·전년에 없던 지역은 NaN, 전년 0건이면 증감률만 NaN)
+    totals = totals.astype(np.float64)
+    if present is not None:
+        totals[~present] = np.nan
+    delta = np.full_like(totals, np.nan)
+    delta[1:] = totals[1:] - totals[:-1]
+    # 연도가 빠져 있으면 (2021 → 2023) 2년치 변화라 전년 대비가 아니다
+    delta[1:][np.diff(np.asarray(years)) != 1] = np.nan
+    prev = np.full_like(totals, np.nan)
+    prev[1:] = totals[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = np.where(prev > 0, delta / prev, np.nan)
+    return delta, growth
+
+
+def build_store(sources, store_dir=CRIME_STORE):
+    """연도별 CSV를 한 해씩 읽어 (연도, 유형, 지역) int32 배열과 전년 대비 지표를 저장합니다.
+
+    원본 목록과 파일 상태 (수정 시각, 크기)가 저장된 것과 같으면 아무것도 하지 않습니다.
+    """
+    meta_path, counts_path, summary_path = _store_paths(store_dir)
+    signature = {str(year): [path, *file_stamp(path)] for year, path in sources.items()}
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            if json.load(f)["sources"] == signature:
+                return
+    except (FileNotFoundError, json.JSONDecodeError, KeyError):
+        pass
+
+    # 1차: 모든 해의 유형·지역 이름을 합쳐 축을 정한다 (행정구역 개편으로 해마다 다를 수 있음, 최근 연도 순서 우선)
+    keys, districts = {}, {}
+    for path in reversed(list(sources.values())):
+        df = read_snapshot(path, _read_crime_csv)
+        keys.update(dict.fromkeys(map(tuple, df[KEY_COLUMNS].to_numpy().tolist())))
+        districts.update(dict.fromkeys(df.columns.drop(KEY_COLUMNS)))
+    keys, districts = list(keys), list(districts)
+    key_index = pd.MultiIndex.from_tuples(keys, names=KEY_COLUMNS)
+
+    # 2차: 한 해씩 배열에 채운다 (메모리에는 한 해치만)
+    os.makedirs(store_dir, exist_ok=True)
+    shape = (len(sources), len(keys), len(districts))
+    counts = np.lib.format.open_memmap(counts_path + ".tmp", mode="w+", dtype=np.int32, shape=shape)
+    present = np.zeros((len(sources), len(districts)), dtype=bool)
+    for y, path in enumerate(sources.values()):
+        grouped = read_snapshot(path, _read_crime_csv).groupby(KEY_COLUMNS, sort=False).sum()
+        present[y] = pd.Index(districts).isin(grouped.columns)
+        counts[y] = grouped.reindex(index=key_index, columns=districts, fill_value=0).to_numpy(dtype=np.int32)
+
+    district_totals = counts.sum(axis=1, dtype=np.int64)
+    crime_totals = counts.sum(axis=2, dtype=np.int64)
+    district_delta, district_growth = _yoy(district_totals, list(sources), present)
+    crime_delta, crime_growth = _yoy(crime_totals, list(sources))
+    counts.flush()
+    del counts
+
+    with open(summary_path + ".tmp", "wb") as f:
+        np.savez(
+            f,
+            present=present,
+            district_totals=district_totals,
+            district_delta=district_delta,
+            district_growth=district_growth,
+            crime_totals=crime_totals,
+            crime_delta=crime_delta,
+            crime_growth=crime_growth,
+        )
+    os.replace(counts_path + ".tmp", counts_path)
+    os.replace(summary_path + ".tmp", summary_path)
+    meta = {"years": list(sources), "keys": keys, "districts": districts, "sources": signature}
+    with open(meta_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(meta_path + ".tmp", meta_path)
+
+
+class CrimeStore:
+    """여러 해의 범죄 건수를 메모리 매핑 배열로 열어 두고, 연도별 큐브와 전년 대비 지표를 제공합니다."""
+
+    def __init__(self, store_dir=CRIME_STORE):
+        meta_path, counts_path, summary_path = _store_paths(store_dir)
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        self.years = meta["years"]
+        self.year_index = {year: i for i, year in enumerate(self.years)}
+        self.keys = [tuple(key) for key in meta["keys"]]
+        self.districts = meta["districts"]
+        self.district_index = {d: i for i, d in enumerate(self.districts)}
+        # 디스크의 배열을 필요한 해만 페이지 단위로 읽는다
+        self.counts = np.load(counts_path, mmap_mode="r")
+        with np.load(summary_path) as summary:
+            self.summary = {name: _readonly(summary[name]) for name in summary.files}
+
+    def year_frame(self, year):
+        """한 해치 건수를 원본 CSV와 같은 모양의 표로 (그해 없는 지역 열은 제외)."""
+        y = self.year_index[year]
+        cols = np.flatnonzero(self.summary["present"][y])
+        frame = pd.DataFrame(self.keys, columns=KEY_COLUMNS)
+        values = pd.DataFrame(np.asarray(self.counts[y][:, cols]), columns=[self.districts[i] for i in cols])
+        return pd.concat([frame, values], axis=1)
+
+    def district_yoy(self, year, district):
+        """(총 건수, 전년 대비 증감, 증감률) — 비교할 전년이 없으면 증감은 NaN."""
+        y, d = self.year_index[year], self.district_index[district]
+        return (
+            int(self.summary["district_totals"][y, d]),
+            float(self.summary["district_delta"][y, d]),
+            float(self.summary["district_growth"][y, d]),
+        )
+
+    def district_series(self, district):
+        """지역 하나의 연도별 총 건수와 전년 대비 증감률."""
+        d = self.district_index[district]
+        present = self.summary["present"][:, d]
+        return pd.DataFrame({
+            "연도": self.years,
+            "총_범죄_건수": self.summary["district_totals"][:, d],
+            "증감": self.summary["district_delta"][:, d],
+            "증감률": self.summary["district_growth"][:, d],
+        })[present]
+
+
+@st.cache_resource(show_spinner="연도별 범죄 저장소를 준비하는 중...", max_entries=2)
+def _store_cached(store_dir, signature):
+    # signature의 파일 상태는 캐시 키로만 쓰인다 (원본이 바뀌면 저장소를 다시 맞춘다)
+    sources = {year: path for year, path, _ in signature}
+    try:
+        build_store(sources, store_dir)
+    except OSError:
+        # 읽기 전용 배포 환경: 같은 구조로 임시 폴더에 만든다
+        store_dir = temp_store_dir(store_dir)
+        build_store(sources, store_dir)
+    store = CrimeStore(store_dir)
+    store.version = signature
+    return store
+
+
+def load_store(source_dir=CRIME_DIR, store_dir=CRIME_STORE):
+    """연도별 원본과 저장소를 맞추고, 모든 세션이 공유하는 저장소를 돌려줍니다."""
+    sources = crime_source_files(source_dir)
+    if not sources:
+        raise FileNotFoundError(CRIME_CSV)
+    signature = tuple((year, path, file_stamp(path)) for year, path in sources.items())
+    return _store_cached(store_dir, signature)
+
+
+@st.cache_resource(show_spinner="범죄 데이터를 불러오는 중...", max_entries=4)
+def _year_cube_cached(_store, version, year, population_path, population_mtime):
+    # _store는 해시하지 않고 version(원본 목록·수정 시각)으로, 인구 표는 수정 시각으로 구분한다
+    return CrimeCube(_store.year_frame(year), load_population(population_path))
+
+
+def load_year_cube(store, year, population_path=POPULATION_CSV):
+    """저장소에서 한 해치만 꺼내 만든 범죄 큐브 (연도별로 세션 간 공유, 인구 표가 추가·수정되면 다시 만듦)."""
+    population_mtime = os.path.getmtime(population_path) if os.path.exists(population_path) else None
+    return _year_cube_cached(store, store.version, year, population_path, population_mtime)
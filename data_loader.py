@@ -0,0 +1,142 @@
+import codecs
+import functools
+import logging
+import os
+import tempfile
+
+import pandas as pd
+import streamlit as st
+
+# 인코딩 판별에 쓰는 앞·뒤 표본 크기 (바이트)
+SNIFF_BYTES = 64 * 1024
+
+# UTF-8 연속 바이트 (뒤쪽 표본이 글자 중간에서 시작할 때 건너뛴다)
+_UTF8_CONTINUATION = bytes(range(0x80, 0xC0))
+
+# 사이드카 Parquet에 원본 파일 상태를 적어 두는 DataFrame.attrs 키
+SOURCE_ATTR = "source"
+
+_logger = logging.getLogger(__name__)
+
+
+# ===== 공통 로더 =====
+def _decodes(sample, encoding):
+    try:
+        # 표본 끝에서 잘린 멀티바이트 글자는 오류로 보지 않는다
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def file_stamp(path):
+    """파일 상태 (수정 시각 ns, 크기) — 캐시 키와 사이드카 신선도 확인에 씁니다."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def sniff_encoding(path, sample_size=SNIFF_BYTES):
+    """파일 앞·뒤 일부 바이트만 보고 utf-8 / cp949 중 인코딩을 판별합니다 (파일 상태가 같으면 다시 읽지 않음)."""
+    mtime_ns, size = file_stamp(path)
+    return _sniff_cached(os.path.abspath(path), mtime_ns, size, sample_size)
+
+
+@functools.lru_cache(maxsize=64)
+def _sniff_cached(path, mtime_ns, size, sample_size):
+    # mtime_ns는 캐시 키로만 쓰인다 (파일이 바뀌면 다시 판별)
+    with open(path, "rb") as f:
+        head = f.read(sample_size)
+        f.seek(max(0, size - sample_size))
+        tail = f.read().lstrip(_UTF8_CONTINUATION)
+
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    # 앞부분이 ASCII뿐이어도 뒤쪽에 한글이 있으면 cp949일 수 있으므로 양쪽을 확인
+    if _decodes(head, "utf-8") and _decodes(tail, "utf-8"):
+        return "utf-8"
+    if _decodes(head, "cp949"):
+        return "cp949"
+    raise ValueError(f"'{path}'의 인코딩을 판별할 수 없습니다 (utf-8, cp949 아님).")
+
+
+def read_csv_once(path, dtype=None, **kwargs):
+    """판별한 인코딩과 명시한 열 타입으로 CSV를 한 번만 파싱합니다."""
+    return pd.read_csv(path, encoding=sniff_encoding(path), dtype=dtype, **kwargs)
+
+
+def sidecar_path(csv_path):
+    """CSV 옆에 저장되는 Parquet 사이드카 경로를 돌려줍니다."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def read_snapshot(csv_path, reader):
+    """사이드카에 적힌 원본 상태가 지금 원본과 정확히 같으면 사이드카를, 아니면 원본을 읽고 사이드카를 갱신합니다.
+
+    수정 시각의 앞뒤가 아니라 (수정 시각 ns, 크기) 일치로 판단하므로, 더 오래된 시각으로 복원된 원본도 다시 읽습니다.
+    """
+    sidecar = sidecar_path(csv_path)
+    stamp = list(file_stamp(csv_path))
+    if os.path.exists(sidecar):
+        try:
+            cached = pd.read_parquet(sidecar)
+        except (OSError, ValueError, ImportError) as e:
+            # 손상되었거나 읽을 수 없는 사이드카는 무시하고 원본에서 다시 만든다
+            _logger.warning("사이드카 %s를 읽지 못해 원본을 다시 읽습니다: %s", sidecar, e)
+        else:
+            if cached.attrs.get(SOURCE_ATTR) == stamp:
+                cached.attrs = {}
+                return cached
+
+    df = reader(csv_path)
+    stamped = df.copy(deep=False)
+    stamped.attrs = {SOURCE_ATTR: stamp}
+    try:
+        stamped.to_parquet(sidecar, index=False)
+    except (OSError, ImportError) as e:
+        # 읽기 전용 배포 환경에서는 사이드카 없이 동작
+        _logger.info("사이드카 %s를 쓰지 못했습니다: %s", sidecar, e)
+    return df
+
+
+def temp_store_dir(store_dir):
+    """읽기 전용 배포 환경에서 저장소 대신 쓰는 임시 폴더 경로 (같은 저장소는 항상 같은 경로)."""
+    return os.path.join(tempfile.gettempdir(), "streamlit-" + os.path.basename(os.path.abspath(store_dir)))
+
+
+# ===== 지하철 승하차 데이터 =====
+SUBWAY_CSV = "jijonsik.csv"
+
+# 열별 저장 타입 (날짜는 YYYYMMDD 정수, 노선/역은 범주형)
+SUBWAY_DTYPES = {
+    "사용일자": "int32",
+    "노선명": "category",
+    "역명": "category",
+    "승차총승객수": "int32",
+    "하차총승객수": "int32",
+}
+
+
+def _read_subway_csv(csv_path):
+    """승하차 CSV를 한 번 파싱해 압축된 열 타입으로 변환합니다."""
+    return read_csv_once(csv_path, dtype=SUBWAY_DTYPES, usecols=list(SUBWAY_DTYPES))
+
+
+# ===== 국가별 MBTI 비율 데이터 =====
+MBTI_CSV = "countriesMBTI_16types.csv"
+
+
+def _read_mbti_csv(csv_path):
+    """국가 열은 문자열, 16개 유형 비율 열은 float32로 한 번 파싱합니다."""
+    header = read_csv_once(csv_path, nrows=0).columns
+    return read_csv_once(csv_path, dtype={c: "str" if c == "Country" else "float32" for c in header})
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _load_mbti_cached(csv_path, stamp):
+    # stamp는 캐시 키로만 쓰인다 (파일이 바뀌면 새로 파싱)
+    return read_snapshot(csv_path, _read_mbti_csv)
+
+
+def load_mbti(csv_path=MBTI_CSV):
+    """국가별 MBTI 비율 데이터를 파일 상태 (수정 시각, 크기) 단위로 한 번만 파싱합니다."""
+    return _load_mbti_cached(csv_path, file_stamp(csv_path))
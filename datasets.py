@@ -0,0 +1,224 @@
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import streamlit as st
+
+from crime_data import POPULATION_CSV, crime_source_files, load_store, load_year_cube
+from data_loader import MBTI_CSV
+from mbti_content import CONTENT_JSON, MBTI_TYPES, load_content
+from mbti_data import load_matrix
+from subway_data import SubwaySnapshot, get_station_ranking, get_trend_rollups, subway_source_files, sync_store
+from tour_catalog import PLACES_CSV, load_catalog
+
+# 원본 파일이 바뀌었는지 확인하는 간격 (초)
+WATCH_INTERVAL = 5.0
+
+
+def _stat(paths):
+    # 파일 목록의 (경로, 수정 시각, 크기) — 하나라도 바뀌면 다시 확인할 대상
+    return tuple((p, os.path.getmtime(p), os.path.getsize(p)) for p in paths if os.path.exists(p))
+
+
+def _digest(paths):
+    # 수정 시각만 바뀐 경우(복사·touch)는 다시 만들지 않도록 내용 해시로 한 번 더 확인
+    digest = hashlib.md5()
+    for p in paths:
+        if os.path.exists(p):
+            digest.update(p.encode("utf-8"))
+            with open(p, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+    return digest.hexdigest()
+
+
+# ===== 데이터셋별 버전 / 불러오기 / 검증 =====
+def _build_subway():
+    # 새 CSV를 저장소에 적재하고, 가장 최근 월의 순위 색인과 전체 기간 추세 색인까지 미리 만들어 둔다
+    snapshot = SubwaySnapshot(sync_store())
+    if snapshot.months:
+        get_station_ranking(snapshot.months[-1], snapshot.store_dir)
+        get_trend_rollups(snapshot.store_dir)
+    return snapshot
+
+
+def _build_crime():
+    store = load_store()
+    load_year_cube(store, store.years[-1])
+    return store
+
+
+def _check_crime(store):
+    if not store.years or (store.summary["district_totals"] < 0).any():
+        raise ValueError("범죄 저장소가 비어 있거나 음수 건수가 있습니다.")
+
+
+def _check_mbti(matrix):
+    if matrix.values.shape[1] != 16:
+        raise ValueError(f"MBTI 유형 열이 16개가 아닙니다: {matrix.values.shape[1]}개")
+    if not np.allclose(matrix.values.sum(axis=1), 1, atol=0.05):
+        raise ValueError("국가별 MBTI 비율의 합이 1이 아닌 행이 있습니다.")
+
+
+def _check_content(content):
+    unknown = {t for item in content.careers + content.works for t in item["types"]} - set(MBTI_TYPES)
+    if unknown:
+        raise ValueError(f"알 수 없는 MBTI 유형: {sorted(unknown)}")
+    if any(set(w.get("reasons", {})) - set(w["types"]) for w in content.works):
+        raise ValueError("추천 이유가 태그되지 않은 유형에 달려 있습니다.")
+
+
+class Dataset:
+    """등록된 데이터셋 하나 — paths()의 파일이 바뀌면 build()로 다시 만들고 check()로 검증합니다."""
+
+    def __init__(self, name, label, paths, build, check=None):
+        self.name = name
+        self.label = label
+        self.paths = paths
+        self.build = build
+        self.check = check
+
+    def version(self):
+        return _stat(self.paths())
+
+    def digest(self):
+        return _digest(self.paths())
+
+
+DATASETS = [
+    Dataset("subway", "지하철 승하차", subway_source_files, _build_subway),
+    # 인구·면적 표는 선택 파일 — 추가·수정되면 지표가 바뀌므로 함께 감시 (그림 캐시 버전에도 반영)
+    Dataset("crime", "지역별 범죄", lambda: [*crime_source_files().values(), POPULATION_CSV], _build_crime, _check_crime),
+    Dataset("mbti", "국가별 MBTI 비율", lambda: [MBTI_CSV], load_matrix, _check_mbti),
+    Dataset("content", "MBTI 진로·추천작", lambda: [CONTENT_JSON], load_content, _check_content),
+    Dataset("places", "서울 관광지", lambda: [PLACES_CSV], load_catalog),
+]
+
+
+# ===== 프로세스 공용 레지스트리 =====
+class Registry:
+    """모든 페이지가 공유하는 데이터셋 핸들 보관소 (읽기 전용 객체를 데이터셋당 하나만 들고 있음).
+
+    원본이 바뀌면 감시 스레드가 새 핸들을 따로 만든 뒤 한 번에 바꿔 끼운다. 이미 실행 중인
+    세션은 받아 둔 이전 핸들을 끝까지 쓰고, 다음 실행부터 새 핸들을 받는다.
+    """
+
+    def __init__(self, datasets):
+        self.datasets = {d.name: d for d in datasets}
+        self._handles = {}  # 이름 → (버전, 내용 해시, 핸들) — 통째로 바꿔 끼워 원자적으로 교체
+        self._errors = {}
+        # 같은 데이터셋을 여러 세션·백그라운드 스레드가 동시에 만들지 않도록 데이터셋별 잠금
+        self._locks = {name: threading.Lock() for name in self.datasets}
+        self._start_lock = threading.Lock()
+        self._threads = {}
+
+    def get(self, name):
+        """데이터셋 핸들 — 있으면 바로 돌려주고(갱신은 감시 스레드 몫), 처음이면 여기서 만듭니다."""
+        entry = self._handles.get(name)
+        if entry is not None:
+            return entry[2]
+        with self._locks[name]:
+            entry = self._handles.get(name)
+            if entry is None:
+                entry = self._load(name)  # 기다리는 동안 다른 쪽에서 만들었으면 그대로 사용
+            return entry[2]
+
+    def snapshot(self, name):
+        """(핸들, 버전) — 같은 교체 단위에서 꺼내므로 둘이 항상 짝이 맞습니다 (그림 캐시 키 등에 사용)."""
+        entry = self._handles.get(name)
+        if entry is None:
+            self.get(name)
+            entry = self._handles[name]
+        return entry[2], entry[1]
+
+    def _load(self, name, previous=None):
+        # 잠금을 쥔 채로 호출 — 새 핸들을 끝까지 만들고 검증한 뒤에만 교체
+        dataset = self.datasets[name]
+        version = dataset.version()
+        digest = dataset.digest()
+        if previous is not None and previous[1] == digest:
+            entry = (version, digest, previous[2])  # 내용은 그대로 (수정 시각만 바뀜)
+        else:
+            try:
+                handle = dataset.build()
+                if dataset.check is not None:
+                    dataset.check(handle)
+            except Exception as e:
+                self._errors[name] = e
+                raise
+            entry = (version, digest, handle)
+        self._handles[name] = entry
+        self._errors.pop(name, None)
+        return entry
+
+    def refresh(self, name):
+        """원본이 바뀌었으면 새 핸들로 교체합니다 (실패하면 이전 핸들 유지). 교체했으면 True."""
+        entry = self._handles.get(name)
+        if entry is None or entry[0] == self.datasets[name].version():
+            return False
+        with self._locks[name]:
+            entry = self._handles.get(name)
+            try:
+                return self._load(name, entry)[2] is not entry[2]
+            except Exception:
+                return False  # 오류는 상태에 남기고 이전 스냅숏을 계속 쓴다
+
+    def _warm(self):
+        for name in self.datasets:
+            try:
+                self.get(name)
+            except Exception:
+                pass  # 오류는 _errors에 남아 상태 표시와 해당 페이지에서 보인다
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            for name in self.datasets:
+                try:
+                    self.refresh(name)
+                except OSError:
+                    pass  # 파일을 바꾸는 도중이면 다음 주기에 다시 확인
+
+    def _start(self, key, target, *args):
+        with self._start_lock:
+            if key not in self._threads:
+                thread = threading.Thread(target=target, args=args, name=f"dataset-{key}", daemon=True)
+                thread.start()
+                self._threads[key] = thread
+        return self._threads[key]
+
+    def warm_up(self):
+        """모든 데이터셋을 백그라운드 스레드에서 미리 불러옵니다 (프로세스당 한 번)."""
+        return self._start("warmup", self._warm)
+
+    def watch(self, interval=WATCH_INTERVAL):
+        """원본 파일 변경을 주기적으로 확인해 바뀐 데이터셋만 백그라운드에서 다시 만듭니다."""
+        return self._start("watch", self._watch, interval)
+
+    def status(self):
+        """데이터셋별 준비 상태 (이름, 설명, 준비됨, 오류)."""
+        return [
+            (name, d.label, name in self._handles, self._errors.get(name))
+            for name, d in self.datasets.items()
+        ]
+
+
+@st.cache_resource(show_spinner=False)
+def get_registry():
+    """프로세스에 하나뿐인 레지스트리 (처음 부른 곳에서 예열과 파일 감시 시작)."""
+    registry = Registry(DATASETS)
+    registry.warm_up()
+    registry.watch()
+    return registry
+
+
+def dataset(name):
+    """페이지에서 쓰는 데이터셋 핸들 (예열이 아직이면 여기서 기다리거나 직접 만든다)."""
+    return get_registry().get(name)
+
+
+def dataset_snapshot(name):
+    """페이지에서 쓰는 (데이터셋 핸들, 데이터 버전)."""
+    return get_registry().snapshot(name)
@@ -0,0 +1,106 @@
+import copy
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+import streamlit as st
+
+# 보관하는 그림의 최대 크기 (처음 직렬화했을 때의 JSON 바이트 합계)
+FIGURE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    """(페이지, 선택값, 데이터 버전) → 읽기 전용 Plotly 그림 사전. 크기 상한을 넘으면 오래 안 쓴 것부터 버립니다."""
+
+    def __init__(self, max_bytes=FIGURE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._specs.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._specs.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, spec, size):
+        if size > self.max_bytes:
+            return  # 상한보다 큰 그림은 보관하지 않는다
+        with self._lock:
+            old = self._specs.pop(key, None)
+            if old is not None:
+                self.bytes -= old[0]
+            self._specs[key] = (size, spec)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (evicted, _) = self._specs.popitem(last=False)
+                self.bytes -= evicted
+
+    def __len__(self):
+        return len(self._specs)
+
+
+class _ReadOnlyDict(dict):
+    # 여러 세션이 같은 사전을 나눠 쓰므로 값을 바꾸는 메서드는 막는다
+    # (없는 키의 pop(key, 기본값)만 허용 — plotly.io.to_json이 trace uid를 지울 때 부른다)
+    def _blocked(self, *args, **kwargs):
+        raise TypeError("캐시된 그림은 읽기 전용입니다.")
+
+    __setitem__ = __delitem__ = __ior__ = clear = popitem = setdefault = update = _blocked
+
+    def pop(self, key, *default):
+        if key in self:
+            self._blocked()
+        return dict.pop(self, key, *default)
+
+    # plotly 그래프 객체는 받은 사전을 복사한 뒤 고치므로, 복사본은 보통 사전으로 준다
+    def __copy__(self):
+        return dict(self)
+
+    def __deepcopy__(self, memo):
+        return {k: copy.deepcopy(v, memo) for k, v in self.items()}
+
+
+def _freeze(value):
+    # JSON으로 한 번 풀어 둔 그림을 읽기 전용 사전·튜플로 바꾼다
+    if isinstance(value, dict):
+        return _ReadOnlyDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _figure_view(spec):
+    # st.plotly_chart가 검증하며 trace 사전에서 "type"을 pop하므로 맨 위와 trace 사전만 새로 만든다
+    # (안쪽 값은 캐시된 읽기 전용 객체를 그대로 공유)
+    return {**spec, "data": [dict(trace) for trace in spec.get("data", ())]}
+
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    """모든 세션이 공유하는 그림 캐시."""
+    return FigureCache()
+
+
+def cached_figure(page, params, version, build):
+    """같은 (page, params, version)이면 build()와 그림 변환을 건너뛰고 저장된 그림을 돌려줍니다.
+
+    params는 그림을 결정하는 선택값 튜플, version은 데이터 버전 (바뀌면 새 키가 된다).
+    처음 한 번만 JSON으로 바꿔 풀어 두고, 이후에는 그 읽기 전용 사전을 st.plotly_chart에 그림 사전으로 넘깁니다.
+    """
+    cache = get_figure_cache()
+    key = (page, params, version)
+    spec = cache.get(key)
+    if spec is None:
+        text = pio.to_json(build(), validate=False)
+        spec = _freeze(json.loads(text))
+        cache.put(key, spec, len(text))
+    return _figure_view(spec)
@@ -1,4 +1,16 @@
 import streamlit as st
+
+from datasets import get_registry
+
+# 앱이 뜨자마자 모든 데이터셋을 백그라운드에서 미리 불러 둔다 (첫 방문자가 파싱 비용을 내지 않도록)
+registry = get_registry()
+with st.sidebar.expander("📦 데이터 준비 상태"):
+  for name, label, ready, error in registry.status():
+    if error is not None:
+      st.error(f"{label}: {error}")
+    else:
+      st.write(f"{'✅' if ready else '⏳'} {label}")
+
 st.title('나의 첫 웹 서비스 만들기!')
 a=st.text_input('이름을 입력해 주세요')
 b=st.selectbox('좋아하는 음식을 선택하시오!',['이차현의 다태운 바게트','쌉뚱땡이 몽블랑','현우의 검은 마음'])
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from mbti_data import TOP_COUNTRIES, rank_colors
+
+# MBTI 분석 페이지 그림 — 페이지는 cached_figure로 감싸 부르고, benchmark.py도 같은 함수를 잰다
+
+
+def country_figure(profile, country):
+    """국가의 MBTI 비율 막대 그래프 (비율 순, 순위별 색)."""
+    fig = px.bar(
+        profile,
+        x='MBTI',
+        y='비율',
+        text='비율',
+        title=f"{country}의 MBTI 비율",
+    )
+
+    fig.update_traces(
+        texttemplate='%{text:.2%}',
+        textposition='outside',
+        marker_color=rank_colors(len(profile))
+    )
+    fig.update_layout(
+        yaxis_tickformat='.0%',
+        template='plotly_white',
+        xaxis_title='MBTI 유형',
+        yaxis_title='비율',
+        showlegend=False
+    )
+    return fig
+
+
+def axis_figure(axis_data, country):
+    """네 성향 축의 비율을 쌓은 가로 막대 그래프."""
+    fig_axis = px.bar(
+        axis_data,
+        x='비율',
+        y='축',
+        color='성향',
+        text='성향',
+        orientation='h',
+        title=f"{country}의 성향 축별 비율",
+    )
+    fig_axis.update_layout(barmode='stack', xaxis_tickformat='.0%', template='plotly_white', showlegend=False, height=320)
+    return fig_axis
+
+
+def similar_figure(matrix, countries, type_order):
+    """여러 국가의 MBTI 분포를 type_order(첫 국가의 비율 순) 순서로 비교하는 선 그래프."""
+    rows = [matrix.country_index[c] for c in countries]
+    compare_df = pd.DataFrame(matrix.values[rows].T, index=matrix.types, columns=countries)
+    compare_df = compare_df.loc[type_order].reset_index(names='MBTI').melt(id_vars='MBTI', var_name='국가', value_name='비율')
+    fig_sim = px.line(compare_df, x='MBTI', y='비율', color='국가', markers=True, title="MBTI 분포 비교 (선택 국가 비율 순)")
+    fig_sim.update_layout(yaxis_tickformat='.0%', template='plotly_white')
+    return fig_sim
+
+
+def cluster_map_figure(cluster_df, cluster_summary, num_clusters):
+    """국가 군집을 색으로 칠한 세계 지도."""
+    fig_map = px.choropleth(
+        cluster_df.assign(군집=cluster_df['군집'].astype(str)),
+        locations='Country',
+        locationmode='country names',
+        color='군집',
+        category_orders={'군집': [str(c) for c in cluster_summary['군집']]},
+        hover_name='Country',
+        title=f"평균 연결 계층 군집 ({num_clusters}개, Jensen-Shannon 거리)",
+    )
+    fig_map.update_layout(template='plotly_white', height=500, margin=dict(l=0, r=0, t=50, b=0))
+    return fig_map
+
+
+def similarity_heatmap(matrix):
+    """국가 간 유사도(1 - 거리) 히트맵 (군집 잎 순서)."""
+    leaves = matrix.leaf_order
+    fig_heat = px.imshow(
+        1 - matrix.distances[np.ix_(leaves, leaves)],
+        x=[matrix.countries[i] for i in leaves],
+        y=[matrix.countries[i] for i in leaves],
+        color_continuous_scale='Blues',
+        labels={'color': '유사도'},
+    )
+    fig_heat.update_layout(height=800)
+    return fig_heat
+
+
+def country_tab_figure(profile, country):
+    """탭 1: 국가의 MBTI 비율 (1등은 빨강, 나머지는 파랑 그라데이션 역방향)."""
+    fig_tab1 = px.bar(
+        profile,
+        x='MBTI',
+        y='비율',
+        text='비율',
+    )
+    fig_tab1.update_traces(texttemplate='%{text:.1%}', textposition='outside', marker_color=rank_colors(len(profile), top_color='red'))
+    fig_tab1.update_layout(
+        showlegend=False,
+        yaxis_tickformat='.0%',
+        yaxis_title="비율",
+        xaxis_title="MBTI 유형",
+        title=f"{country}의 MBTI 비율",
+    )
+    return fig_tab1
+
+
+def type_top_figure(top10, mbti_type, selected_country):
+    """탭 2: 유형 비율 상위 국가 (비율이 낮을수록 진한 파랑, 선택 국가는 보라색)."""
+    values = top10['비율'].to_numpy()
+    span = values.max() - values.min()
+    norm = (values.max() - values) / span if span > 0 else np.zeros(len(values))
+    colors = np.where(
+        top10['Country'] == selected_country,
+        'rgba(180,60,180,1)',
+        [f"rgba(0, 0, 255, {0.3 + 0.7 * v:.3f})" for v in norm],
+    ).tolist()
+
+    fig_tab2 = px.bar(
+        top10,
+        x='Country',
+        y='비율',
+        text='비율',
+        hover_data={'순위': True},
+    )
+
+    fig_tab2.update_traces(texttemplate='%{text:.1%}', textposition='outside', marker_color=colors)
+    fig_tab2.update_layout(
+        showlegend=False,
+        yaxis_tickformat='.0%',
+        yaxis_title="비율",
+        xaxis_title="국가",
+        title=f"{mbti_type} 유형 비율이 높은 국가 Top {TOP_COUNTRIES}",
+    )
+    return fig_tab2
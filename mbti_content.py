@@ -0,0 +1,192 @@
+import json
+import os
+
+import numpy as np
+import streamlit as st
+
+# 진로·추천작 콘텐츠 파일 (항목마다 types: 어울리는 MBTI 유형 목록)
+# 추천작은 작품당 한 항목 — reasons: 유형별 추천 이유, genres: 장르 목록
+CONTENT_JSON = "mbti_content.json"
+
+MBTI_TYPES = [
+    "ISTJ", "ISFJ", "INFJ", "INTJ",
+    "ISTP", "ISFP", "INFP", "INTP",
+    "ESTP", "ESFP", "ENFP", "ENTP",
+    "ESTJ", "ESFJ", "ENFJ", "ENTJ",
+]
+
+# 패턴에서 아무 글자나 허용하는 자리 표시
+WILDCARDS = "X_*?"
+
+# 추천 순위: 축 일치 개수(0~4)에 더하는 유형 정확 일치 가산점, 한 페이지 항목 수
+EXACT_BONUS = 0.5
+PAGE_SIZE = 5
+
+# 유형별 네 축 벡터 (E, S, T, J이면 1)
+TYPE_VECTORS = np.array([[t[a] == c for a, c in enumerate("ESTJ")] for t in MBTI_TYPES], dtype=np.float32)
+
+
+def matching_types(pattern):
+    """'xNTx'처럼 자리별로 글자를 고정한 패턴에 맞는 MBTI 유형 목록 (x, _, *, ?는 아무 글자)."""
+    pattern = pattern.strip().upper()
+    if len(pattern) != 4:
+        raise ValueError(f"MBTI 패턴은 네 글자여야 합니다: '{pattern}'")
+    return [t for t in MBTI_TYPES if all(p in WILDCARDS or p == c for p, c in zip(pattern, t))]
+
+
+def _readonly(arr):
+    arr.setflags(write=False)
+    return arr
+
+
+def _index(items, keys_of):
+    # 키 → 항목 번호 배열 (번호는 파일 순서라 항상 정렬되어 있다)
+    index = {}
+    for i, item in enumerate(items):
+        for key in dict.fromkeys(keys_of(item)):
+            index.setdefault(key, []).append(i)
+    return {key: np.array(ids, dtype=np.int32) for key, ids in index.items()}
+
+
+def _merge_works(works):
+    """같은 (종류, 제목)의 추천작을 한 항목으로 합칩니다 (유형·이유·장르는 처음 나온 순서로 모음)."""
+    merged = {}
+    for work in works:
+        item = merged.get((work["kind"], work["title"]))
+        if item is None:
+            merged[work["kind"], work["title"]] = {**work, "types": list(work["types"]),
+                                                   "reasons": dict(work.get("reasons", {})),
+                                                   "genres": list(work.get("genres", []))}
+            continue
+        item["types"] += [t for t in work["types"] if t not in item["types"]]
+        item["reasons"].update({t: r for t, r in work.get("reasons", {}).items() if t not in item["reasons"]})
+        item["genres"] += [g for g in work.get("genres", []) if g not in item["genres"]]
+    return list(merged.values())
+
+
+def _affinity(items):
+    """항목 x 16유형 (축 일치 개수, 정렬용 점수) — 태그된 유형 중 가장 잘 맞는 유형 기준."""
+    type_pos = {t: i for i, t in enumerate(MBTI_TYPES)}
+    tags = np.zeros((len(items), len(MBTI_TYPES)), dtype=bool)
+    for i, item in enumerate(items):
+        for t in item["types"]:
+            tags[i, type_pos[t]] = True
+    # 유형끼리 같은 글자인 축 개수 (16 x 16)
+    type_overlap = TYPE_VECTORS @ TYPE_VECTORS.T + (1 - TYPE_VECTORS) @ (1 - TYPE_VECTORS).T
+    # 여러 유형에 태그된 항목은 평균이 아니라 가장 가까운 태그 유형의 점수 (유형 수만큼만 반복)
+    overlap = np.zeros((len(items), len(MBTI_TYPES)), dtype=np.float32)
+    for t in range(len(MBTI_TYPES)):
+        np.maximum(overlap, np.where(tags[:, t, None], type_overlap[t], 0), out=overlap)
+    return overlap, overlap + EXACT_BONUS * tags
+
+
+def _rank_orders(scores, groups):
+    # (유형, 그룹) → 점수 내림차순 항목 번호 (같은 점수는 파일 순서), 그룹 None은 전체
+    masks = {}
+    for group, ids in groups.items():
+        masks[group] = np.zeros(len(scores), dtype=bool)
+        masks[group][ids] = True
+    orders = {}
+    for j, t in enumerate(MBTI_TYPES):
+        order = np.argsort(-scores[:, j], kind="stable").astype(np.int32)
+        orders[t, None] = _readonly(order)
+        for group, mask in masks.items():
+            orders[t, group] = _readonly(order[mask[order]])
+    return orders
+
+
+# ===== 콘텐츠 저장소 =====
+class ContentStore:
+    """진로·책·영화 항목을 한 번 읽어 MBTI 유형·학과·종류·장르별 색인을 만들어 둡니다 (읽기 전용)."""
+
+    def __init__(self, data):
+        self.careers = data.get("careers", [])
+        # 같은 작품이 여러 항목으로 들어와도 순위에는 한 번만 나오도록 합친다
+        self.works = _merge_works(data.get("works", []))
+
+        self.career_by_type = _index(self.careers, lambda c: c["types"])
+        self.career_by_department = _index(self.careers, lambda c: c.get("departments", []))
+
+        self.work_by_type = _index(self.works, lambda w: w["types"])
+        self.work_by_kind = _index(self.works, lambda w: [w["kind"]])
+        self.work_by_genre = _index(self.works, lambda w: w.get("genres", []))
+
+        # 추천작이 있는 유형 (파일에 처음 나온 순서)
+        self.work_types = list(dict.fromkeys(t for w in self.works for t in w["types"]))
+        self.departments = sorted(self.career_by_department)
+        self.kinds = list(self.work_by_kind)
+        self.genres = sorted(self.work_by_genre)
+
+        # 유형별 추천 순위는 여기서 한 번만 정렬 (조회는 페이지만큼 잘라 쓰기)
+        self.career_fit, career_scores = _affinity(self.careers)
+        self.work_fit, work_scores = _affinity(self.works)
+        self.career_orders = _rank_orders(career_scores, {})
+        self.work_orders = _rank_orders(work_scores, self.work_by_kind)
+
+    @staticmethod
+    def _ids_for(by_type, pattern):
+        # 축 패턴(xNTx)을 유형 목록으로 펼쳐 유형 색인을 합친다 — 여러 유형에 걸친 항목도 정확히 걸러진다
+        ids = [by_type[t] for t in matching_types(pattern) if t in by_type]
+        return np.unique(np.concatenate(ids)) if ids else np.empty(0, dtype=np.int32)
+
+    def careers_for(self, pattern, department=None):
+        """유형(ISTJ) 또는 패턴(xNTx)에 어울리는 진로 항목 (학과로 더 좁힐 수 있음)."""
+        ids = self._ids_for(self.career_by_type, pattern)
+        if department is not None:
+            ids = np.intersect1d(ids, self.career_by_department.get(department, []), assume_unique=True)
+        return [self.careers[i] for i in ids]
+
+    def works_for(self, pattern, kind=None, genre=None):
+        """유형 또는 패턴에 어울리는 추천작 (종류·장르로 더 좁힐 수 있음)."""
+        ids = self._ids_for(self.work_by_type, pattern)
+        if kind is not None:
+            ids = np.intersect1d(ids, self.work_by_kind.get(kind, []), assume_unique=True)
+        if genre is not None:
+            ids = np.intersect1d(ids, self.work_by_genre.get(genre, []), assume_unique=True)
+        return [self.works[i] for i in ids]
+
+    @staticmethod
+    def reason_for(item, mbti, fit):
+        """선택한 유형에 맞춰 쓴 추천 이유 (그 유형 태그가 없으면 적합도 fit(0~1)으로 겹치는 축 수를 알려 주는 문구)."""
+        reason = item.get("reasons", {}).get(mbti)
+        if reason:
+            return reason
+        shared = round(fit * 4)  # fit은 겹치는 축 수 / 4 (가장 잘 맞는 태그 유형 기준)
+        if shared == 0:
+            match = "성향 네 가지가 모두 달라서, 새로운 취향을 넓혀 볼 수 있어"
+        elif shared == 1:
+            match = "성향 네 가지 중 한 가지만 같아서, 새로운 취향을 넓혀 볼 수 있어"
+        elif shared == 2:
+            match = "성향 네 가지 중 두 가지가 같아, 절반쯤은 통할 거야"
+        else:
+            match = f"성향 네 가지 중 {'세' if shared == 3 else '네'} 가지가 같아, 너와 겹치는 성향이 많아 👀"
+        return f"{'·'.join(item['types'])} 유형에게 추천된 작품이야. {match}"
+
+    def ranked_careers(self, mbti, page=1, page_size=PAGE_SIZE):
+        """유형과 축이 많이 겹치는 순서의 진로 한 페이지 — ([(항목, 적합도 0~1)], 전체 페이지 수)."""
+        return self._page(self.careers, self.career_fit, self.career_orders[mbti, None], mbti, page, page_size)
+
+    def ranked_works(self, mbti, kind=None, page=1, page_size=PAGE_SIZE):
+        """유형과 축이 많이 겹치는 순서의 추천작 한 페이지 (종류별) — ([(항목, 적합도 0~1)], 전체 페이지 수)."""
+        order = self.work_orders.get((mbti, kind), np.empty(0, dtype=np.int32))
+        return self._page(self.works, self.work_fit, order, mbti, page, page_size)
+
+    @staticmethod
+    def _page(items, fit, order, mbti, page, page_size):
+        pages = max(1, -(-len(order) // page_size))
+        page = min(max(1, page), pages)
+        ids = order[(page - 1) * page_size:page * page_size]
+        j = MBTI_TYPES.index(mbti)
+        return [(items[i], float(fit[i, j]) / 4) for i in ids], pages
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _content_cached(path, mtime):
+    # mtime은 캐시 키로만 쓰인다 (파일이 바뀌면 다시 읽는다)
+    with open(path, encoding="utf-8") as f:
+        return ContentStore(json.load(f))
+
+
+def load_content(path=CONTENT_JSON):
+    """콘텐츠 파일을 수정 시각 단위로 프로세스당 한 번만 읽어 모든 페이지가 공유합니다."""
+    return _content_cached(path, os.path.getmtime(path))
@@ -0,0 +1,241 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import MBTI_CSV, file_stamp, load_mbti
+
+# 네 축 (앞 글자, 뒷 글자) — 유형 이름의 같은 자리 글자로 판별
+AXES = [("E", "I"), ("S", "N"), ("T", "F"), ("J", "P")]
+AXIS_LETTERS = {letter: (a, pair) for a, pair in enumerate(AXES) for letter in pair}
+
+# 유형별 국가 순위 탭에서 미리 만들어 두는 Top N
+TOP_COUNTRIES = 10
+
+
+def _readonly(arr):
+    arr.setflags(write=False)
+    return arr
+
+
+def rank_colors(n, top_color="#FF4C4C"):
+    """정렬된 막대 순서별 색 (1등은 빨강, 나머지는 순위가 낮을수록 옅은 파랑)."""
+    alpha = 0.4 + 0.6 * (1 - np.arange(n) / max(n, 1))
+    return [top_color] + [f"rgba(0, 123, 255, {a})" for a in alpha[1:]]
+
+
+# ===== 분포 간 거리와 계층 군집 (scipy 없이 numpy로) =====
+def _neg_entropy(p):
+    # 행마다 sum(p * log2 p) (0 * log 0 = 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(p > 0, p * np.log2(p), 0.0).sum(axis=-1)
+
+
+def js_distance_matrix(values, block=64):
+    """행(확률 분포)끼리의 Jensen-Shannon 거리 행렬 (0~1, 밑 2).
+
+    JS = H(m) - (H(p) + H(q)) / 2 를 block개 행씩 계산해, 임시 배열을 block x n x 유형 수로 묶어 둡니다.
+    """
+    p = np.asarray(values, dtype=np.float64)
+    p = p / p.sum(axis=1, keepdims=True)
+    n = len(p)
+    own = _neg_entropy(p)
+    js = np.empty((n, n))
+    for start in range(0, n, block):
+        m = (p[start:start + block, None, :] + p[None, :, :]) / 2
+        js[start:start + block] = (own[start:start + block, None] + own[None, :]) / 2 - _neg_entropy(m)
+    js = (js + js.T) / 2  # 반올림 오차로 생기는 비대칭 제거
+    np.fill_diagonal(js, 0.0)
+    return np.sqrt(np.clip(js, 0.0, 1.0))
+
+
+def average_linkage(dist):
+    """평균 연결 계층 군집 — scipy linkage와 같은 (n-1) x 4 병합 표 [a, b, 거리, 크기].
+
+    행마다 가장 가까운 군집을 기억해 두고 병합으로 바뀐 행만 다시 찾으므로, 한 단계는 보통 O(n)입니다.
+    거리 행렬 사본(n x n float64)을 쓰므로 메모리는 O(n²) — 국가 수천 곳까지를 대상으로 합니다.
+    """
+    n = len(dist)
+    d = np.array(dist, dtype=np.float64)
+    np.fill_diagonal(d, np.inf)
+    size = np.ones(n)
+    ids = np.arange(n)
+    merges = np.empty((max(n - 1, 0), 4))
+    # 행별 최소 거리와 그 열 (같은 거리면 앞 열 — 전체 argmin과 같은 순서로 병합)
+    nearest = d.argmin(axis=1) if n else np.empty(0, dtype=int)
+    best = d[np.arange(n), nearest]
+    for step in range(n - 1):
+        i = int(best.argmin())
+        j = int(nearest[i])
+        i, j = min(i, j), max(i, j)
+        merges[step] = [min(ids[i], ids[j]), max(ids[i], ids[j]), d[i, j], size[i] + size[j]]
+        # Lance-Williams: 합친 군집까지의 거리는 크기로 가중한 평균, j 자리는 비운다
+        row = (size[i] * d[i] + size[j] * d[j]) / (size[i] + size[j])
+        d[i, :] = row
+        d[:, i] = row
+        d[i, i] = np.inf
+        d[j, :] = np.inf
+        d[:, j] = np.inf
+        size[i] += size[j]
+        ids[i] = n + step
+
+        # 가장 가까운 군집이 i나 j였던 행은 다시 찾고, 나머지는 새 i와만 비교한다
+        row = d[i]
+        stale = (nearest == i) | (nearest == j)
+        closer = ~stale & ((row < best) | ((row == best) & (i < nearest)))
+        nearest[closer] = i
+        best[closer] = row[closer]
+        stale[i] = True
+        stale[j] = False
+        rows = np.flatnonzero(stale)
+        nearest[rows] = d[rows].argmin(axis=1)
+        best[rows] = d[rows, nearest[rows]]
+        nearest[j], best[j] = j, np.inf
+    return merges
+
+
+def cut_tree(merges, k):
+    """병합 표를 k개 군집이 남을 때까지만 적용한 군집 번호 (1부터, 큰 군집 순)."""
+    n = len(merges) + 1
+    parent = np.arange(2 * n - 1)
+    for step in range(n - max(k, 1)):
+        a, b = int(merges[step, 0]), int(merges[step, 1])
+        parent[a] = parent[b] = n + step
+    # 각 잎에서 마지막으로 합쳐진 조상까지 따라간다
+    roots = np.arange(n)
+    while True:
+        up = parent[roots]
+        if (up == roots).all():
+            break
+        roots = up
+    _, labels, counts = np.unique(roots, return_inverse=True, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    rename = np.empty_like(order)
+    rename[order] = np.arange(1, len(order) + 1)
+    return rename[labels]
+
+
+def leaf_order(merges):
+    """덴드로그램 잎 순서 (비슷한 행끼리 붙도록 히트맵 정렬에 사용)."""
+    n = len(merges) + 1
+    if n == 1:
+        return np.zeros(1, dtype=int)
+    order, stack = [], [2 * n - 2]
+    while stack:
+        node = stack.pop()
+        if node < n:
+            order.append(node)
+        else:
+            a, b = merges[node - n, :2].astype(int)
+            stack.extend([b, a])
+    return np.array(order)
+
+
+# ===== 국가 x 유형 비율 행렬 =====
+class MbtiMatrix:
+    """국가 x 16유형 비율을 float32 배열로 들고, 국가별·유형별 순위와 네 축 비율을 미리 계산해 둡니다."""
+
+    def __init__(self, df):
+        self.frame = df
+        self.countries = df["Country"].astype(str).tolist()
+        self.types = [c for c in df.columns if c != "Country"]
+        self.values = _readonly(df[self.types].to_numpy(dtype=np.float32))
+        self.country_index = {c: i for i, c in enumerate(self.countries)}
+        self.type_index = {t: j for j, t in enumerate(self.types)}
+
+        # 국가별 유형 순서 (비율 내림차순), 유형별 국가 순서와 순위 (1위부터)
+        self.country_orders = _readonly(np.argsort(-self.values, axis=1, kind="stable"))
+        self.type_orders = _readonly(np.argsort(-self.values, axis=0, kind="stable").T.copy())
+        ranks = np.empty(self.type_orders.shape, dtype=np.int32)
+        np.put_along_axis(ranks, self.type_orders, np.arange(1, len(self.countries) + 1, dtype=np.int32)[None, :], axis=1)
+        self.type_ranks = _readonly(ranks)
+
+        # 네 축의 앞 글자(E, S, T, J) 비율 = 해당 글자를 가진 유형 비율의 합
+        letters = np.array([[t[a] == pair[0] for a, pair in enumerate(AXES)] for t in self.types], dtype=np.float32)
+        self.axis_marginals = _readonly(self.values @ letters)
+        self.axis_orders = _readonly(np.argsort(-self.axis_marginals, axis=0, kind="stable").T.copy())
+        # 유형별 Top N 국가 표 (순위 탭은 조회만)
+        self.type_tops = {t: self.type_leaderboard(t, TOP_COUNTRIES) for t in self.types}
+
+        # 국가 간 분포 거리·유사 국가 순서·계층 군집은 여기서 한 번만 (질의는 잘라 쓰기만)
+        self.distances = _readonly(js_distance_matrix(self.values))
+        others = self.distances.copy()
+        np.fill_diagonal(others, np.inf)  # 분포가 똑같은 국가가 있어도 자기 자신은 맨 뒤로
+        self.similar_orders = _readonly(np.argsort(others, axis=1, kind="stable")[:, :-1])
+        self.linkage = _readonly(average_linkage(self.distances))
+        self.leaf_order = _readonly(leaf_order(self.linkage))
+
+    def country_profile(self, country):
+        """국가 하나의 16유형 비율 (내림차순)."""
+        i = self.country_index[country]
+        order = self.country_orders[i]
+        return pd.DataFrame({"MBTI": np.array(self.types)[order], "비율": self.values[i, order]})
+
+    def type_leaderboard(self, mbti_type, n=10):
+        """한 유형의 비율이 높은 국가 Top N."""
+        j = self.type_index[mbti_type]
+        order = self.type_orders[j, :n]
+        return pd.DataFrame({
+            "순위": np.arange(1, len(order) + 1),
+            "Country": np.array(self.countries)[order],
+            "비율": self.values[order, j],
+        })
+
+    def axis_shares(self, letter):
+        """한 글자(E, I, S, N, ...)의 국가별 비율 배열."""
+        a, pair = AXIS_LETTERS[letter]
+        share = self.axis_marginals[:, a]
+        return share if letter == pair[0] else 1 - share
+
+    def axis_leaderboard(self, letter, n=10):
+        """한 글자 성향(E, I, S, N, ...)의 비율이 높은 국가 Top N."""
+        a, pair = AXIS_LETTERS[letter]
+        # 뒷 글자는 앞 글자 순서를 뒤집으면 된다
+        order = self.axis_orders[a] if letter == pair[0] else self.axis_orders[a][::-1]
+        order = order[:n]
+        return pd.DataFrame({
+            "순위": np.arange(1, len(order) + 1),
+            "Country": np.array(self.countries)[order],
+            "비율": self.axis_shares(letter)[order],
+        })
+
+    def axis_profile(self, country):
+        """국가 하나의 네 축 비율 (축, 글자, 비율) — 축마다 두 행."""
+        share = self.axis_marginals[self.country_index[country]]
+        rows = []
+        for a, (first, second) in enumerate(AXES):
+            rows.append((f"{first}/{second}", first, float(share[a])))
+            rows.append((f"{first}/{second}", second, float(1 - share[a])))
+        return pd.DataFrame(rows, columns=["축", "성향", "비율"])
+
+    def similar_countries(self, country, n=10):
+        """MBTI 분포가 가장 비슷한 국가 Top N (Jensen-Shannon 거리 기준)."""
+        i = self.country_index[country]
+        order = self.similar_orders[i, :n]
+        return pd.DataFrame({
+            "순위": np.arange(1, len(order) + 1),
+            "Country": np.array(self.countries)[order],
+            "유사도": 1 - self.distances[i, order],
+        })
+
+    def clusters(self, k):
+        """계층 군집을 k개로 자른 국가별 군집 번호와, 군집별 국가 수·평균 분포 상위 유형."""
+        labels = cut_tree(self.linkage, k)
+        assign = pd.DataFrame({"Country": self.countries, "군집": labels})
+        rows = []
+        for c in range(1, labels.max() + 1):
+            mean = self.values[labels == c].mean(axis=0)
+            top = np.argsort(-mean, kind="stable")[:3]
+            rows.append((c, int((labels == c).sum()), ", ".join(self.types[t] for t in top)))
+        summary = pd.DataFrame(rows, columns=["군집", "국가 수", "평균 상위 유형"])
+        return assign, summary
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _matrix_cached(csv_path, stamp):
+    # stamp는 캐시 키로만 쓰인다 (파일이 바뀌면 다시 계산)
+    return MbtiMatrix(load_mbti(csv_path))
+
+
+def load_matrix(csv_path=MBTI_CSV):
+    """국가별 MBTI 비율 행렬과 순위를 파일 상태 (수정 시각, 크기) 단위로 한 번만 만들어 모든 세션이 공유합니다."""
+    return _matrix_cached(csv_path, file_stamp(csv_path))
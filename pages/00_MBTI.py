@@ -2,99 +2,53 @@
 
 import streamlit as st
 
-MBTI_LIST = [
-    "ISTJ", "ISFJ", "INFJ", "INTJ",
-    "ISTP", "ISFP", "INFP", "INTP",
-    "ESTP", "ESFP", "ENFP", "ENTP",
-    "ESTJ", "ESFJ", "ENFJ", "ENTJ",
-]
-
-MBTI_CAREERS = {
-    "ISTJ": [
-        {"career": "공인회계사 / 세무 전문가", "dept": "회계학과·경영학과", "personality": "체계적이고 책임감 있는 성향으로, 정확한 분석과 규칙 준수를 중시함. 기업의 재무 건전성과 공공 신뢰를 지키는 역할에 적합함.", "emoji": "📊"},
-        {"career": "품질관리 / 생산관리 엔지니어", "dept": "산업공학과·품질경영학과", "personality": "표준과 절차에 강하며, 문제를 구조적으로 해결하는 능력이 뛰어남. 산업현장의 효율을 극대화하는 관리형 리더로 성장 가능.", "emoji": "🏗️"},
-    ],
-    "ISFJ": [
-        {"career": "임상간호사 / 보건행정 전문가", "dept": "간호학과·보건행정학과", "personality": "섬세하고 헌신적인 성향으로, 타인의 안녕을 세심하게 돌보는 데 능함. 안정적 환경 속에서 꾸준히 전문성을 쌓는 데 적합.", "emoji": "🩺"},
-        {"career": "교육행정 / 사회복지 공무원", "dept": "행정학과·사회복지학과", "personality": "공공선과 질서를 중시하며, 책임감 있고 신뢰감 있는 조력자형 리더십 보유.", "emoji": "📚"},
-    ],
-    "INFJ": [
-        {"career": "심리상담사 / 임상심리 연구원", "dept": "심리학과·상담심리학과", "personality": "타인의 감정 흐름을 깊이 이해하고 장기적 관점에서 변화를 이끄는 이상주의자. 인문적 통찰력과 분석력을 겸비.", "emoji": "🧠"},
-        {"career": "사회혁신 기획자 / 비영리조직 전문가", "dept": "사회학과·공공정책학과", "personality": "사회문제에 공감하며 실질적 대안을 제시하는 통찰형 리더. 사명감과 설득력이 강함.", "emoji": "🤝"},
-    ],
-    "INTJ": [
-        {"career": "데이터 사이언티스트 / AI 연구원", "dept": "컴퓨터공학과·통계학과", "personality": "논리적 구조를 바탕으로 복잡한 시스템을 분석하고 개선하는 전략가. 미래지향적 통찰력 보유.", "emoji": "💻"},
-        {"career": "R&D 연구기획 / 기술 전략가", "dept": "공학계열·경영공학과", "personality": "혁신적 문제 해결에 집중하며, 효율적 시스템 설계를 즐김. 리더십과 집중력의 조합.", "emoji": "🔬"},
-    ],
-    "ISTP": [
-        {"career": "로봇공학 / 기계설계 엔지니어", "dept": "기계공학과·메카트로닉스학과", "personality": "현실적 감각과 실험적 접근으로 실용적 결과를 창출. 기술적 디테일에 강함.", "emoji": "🛠️"},
-        {"career": "항공정비사 / 자동차 기술전문가", "dept": "항공공학과·자동차공학과", "personality": "위기 대처 능력이 탁월하고 손재주가 뛰어나며, 효율 중심으로 움직임.", "emoji": "✈️"},
-    ],
-    "ISFP": [
-        {"career": "셰프 / 파티시에", "dept": "조리과학과·제과제빵학과", "personality": "감각적이고 창의적이며, 세밀한 표현과 미적 감수성이 풍부. 손끝의 정성과 예술적 감각이 융합된 직업에 적합.", "emoji": "🍰"},
-        {"career": "플로리스트 / 인테리어 디자이너", "dept": "원예학과·실내디자인학과", "personality": "자연과 조화로운 미적 감각을 지녔으며, 공간과 색채를 조화시키는 감성형 크리에이터.", "emoji": "🌷"},
-    ],
-    "INFP": [
-        {"career": "작가 / 스토리텔러", "dept": "문예창작학과·미디어커뮤니케이션학과", "personality": "이상과 가치 중심 사고로 감정을 글과 예술로 표현. 공감과 내면 통찰에 능함.", "emoji": "✍️"},
-        {"career": "문화기획 / 예술경영 전문가", "dept": "문화콘텐츠학과·예술경영학과", "personality": "감성적이면서도 이상적 세계를 현실로 구현하려는 창조형 사색가.", "emoji": "🎭"},
-    ],
-    "INTP": [
-        {"career": "AI 개발자 / 연구 과학자", "dept": "컴퓨터공학과·수학과", "personality": "논리 구조와 시스템 사고를 바탕으로 새로운 지식을 탐구하는 분석형 혁신가.", "emoji": "🧮"},
-        {"career": "학문 연구원 / 교수", "dept": "전공 이론 연구 분야", "personality": "깊이 있는 탐구를 즐기며 독립적인 연구를 선호하는 사색형 사고가.", "emoji": "📖"},
-    ],
-    "ESTP": [
-        {"career": "마케팅 / 이벤트 플래너", "dept": "경영학과·광고홍보학과", "personality": "순간 판단력과 대인 감각이 뛰어나며, 현장에서 역동적으로 문제를 해결함.", "emoji": "🎯"},
-        {"career": "스포츠 매니저 / 방송 PD", "dept": "체육학과·미디어학과", "personality": "활동적이고 경쟁적인 환경에서 성취감을 느끼는 도전가형 인재.", "emoji": "🏆"},
-    ],
-    "ESFP": [
-        {"career": "공연예술가 / 배우", "dept": "연극영화학과·공연예술학과", "personality": "사람 앞에서 자신을 표현하고 에너지를 나누는 것을 즐김. 감정 표현이 풍부함.", "emoji": "🎤"},
-        {"career": "리테일 매니저 / 서비스 기획자", "dept": "유통관리학과·호텔경영학과", "personality": "친화력 높고 분위기 메이커형. 고객 만족을 최우선으로 생각함.", "emoji": "🛍️"},
-    ],
-    "ENFP": [
-        {"career": "브랜드 기획 / 콘텐츠 크리에이터", "dept": "광고홍보학과·디지털미디어학과", "personality": "아이디어가 넘치며 새로운 트렌드를 이끄는 감성형 리더. 사회적 영향력에 관심 많음.", "emoji": "✨"},
-        {"career": "인적자원개발 / 코치", "dept": "심리학과·교육학과", "personality": "사람의 성장과 가능성을 믿으며, 관계를 통해 영감을 주는 인재.", "emoji": "🤗"},
-    ],
-    "ENTP": [
-        {"career": "창업가 / 기술 혁신가", "dept": "경영학과·융합공학과", "personality": "새로운 가능성을 발견하고 실험을 즐기는 혁신형 사고가. 리스크 감수에 능함.", "emoji": "🚀"},
-        {"career": "전략 컨설턴트 / 기획 디렉터", "dept": "산업공학과·경제학과", "personality": "논리적 사고와 설득력을 결합해 조직 혁신을 이끄는 전략가형 인재.", "emoji": "🧭"},
-    ],
-    "ESTJ": [
-        {"career": "프로젝트 매니저 / 관리자", "dept": "경영학과·산업공학과", "personality": "조직과 시스템 운영에 강하고, 명확한 목표 달성을 추구하는 실무형 리더.", "emoji": "📅"},
-        {"career": "공공행정 / 정책관리자", "dept": "행정학과·정책학과", "personality": "규율과 질서를 중시하며, 공공의 효율적 운영을 위해 헌신함.", "emoji": "🏛️"},
-    ],
-    "ESFJ": [
-        {"career": "교육 컨설턴트 / 상담교사", "dept": "교육학과·상담교육학과", "personality": "다른 사람의 성장을 돕는 데 기쁨을 느끼며, 협동과 조화를 중시함.", "emoji": "🧑‍🏫"},
-        {"career": "고객관리 / 커뮤니케이션 전문가", "dept": "경영학과·홍보학과", "personality": "사람과의 신뢰 관계를 중시하고, 세심한 배려로 협업을 이끌어냄.", "emoji": "🤝"},
-    ],
-    "ENFJ": [
-        {"career": "HR 리더 / 교육 코치", "dept": "심리학과·인적자원개발학과", "personality": "조직 내 사람을 성장시키고 팀워크를 강화하는 리더형 조력자.", "emoji": "🌱"},
-        {"career": "사회정책 기획자 / NGO 리더", "dept": "사회복지학과·정책학과", "personality": "타인을 위한 변화를 이끌며, 사회적 가치를 창출하는 추진형 리더.", "emoji": "🌍"},
-    ],
-    "ENTJ": [
-        {"career": "기업 경영자 / 전략 컨설턴트", "dept": "경영학과·경제학과", "personality": "비전을 현실로 만드는 추진력과 조직 통찰력을 지닌 천성적 리더.", "emoji": "🏆"},
-        {"career": "투자분석가 / 정책기획관", "dept": "금융학과·행정학과", "personality": "데이터 기반 판단력과 강한 목표 지향성을 가진 전략 설계자.", "emoji": "💡"},
-    ],
-}
+from datasets import dataset
+from mbti_content import MBTI_TYPES, PAGE_SIZE
 
 st.set_page_config(page_title="MBTI 진로 추천 전문가 버전", layout="centered")
 
+# 진로 항목은 공용 콘텐츠 파일(mbti_content.json)에서 프로세스당 한 번만 읽는다 (공용 레지스트리)
+content = dataset("content")
+
 st.title("🎓 MBTI 기반 진로 탐색 도우미")
-st.markdown("친구들, 자신의 성격유형을 이해하면 진로 방향이 훨씬 명확해집니다. 아래에서 MBTI 유형을 선택하면 **전문 진로 2가지**, **추천 학과**, 그리고 **적합한 성격 특징**을 함께 볼 수 있습니다. 💡")
+st.markdown("친구들, 자신의 성격유형을 이해하면 진로 방향이 훨씬 명확해집니다. 아래에서 MBTI 유형을 선택하면 **어울리는 순서대로 정렬된 진로**, **추천 학과**, 그리고 **적합한 성격 특징**을 함께 볼 수 있습니다. 💡")
 
-mbti = st.selectbox("MBTI 유형을 선택하세요:", MBTI_LIST)
+mbti = st.selectbox("MBTI 유형을 선택하세요:", MBTI_TYPES)
 
+# 버튼은 한 번만 눌려도 페이지를 넘기는 동안 결과가 유지되도록 세션에 기억
 if st.button("진로 추천 보기 🚀"):
-    careers = MBTI_CAREERS.get(mbti)
+    st.session_state["career_mbti"] = mbti
+
+if st.session_state.get("career_mbti") == mbti:
+    # 유형과 겹치는 축이 많은 진로부터 (순위는 콘텐츠 저장소에 미리 정렬됨)
+    page = st.session_state.get("career_page", 1)
+    careers, pages = content.ranked_careers(mbti, page)
     if careers:
         st.subheader(f"{mbti} 유형에 어울리는 진로")
-        for i, item in enumerate(careers, start=1):
+        start = (min(page, pages) - 1) * PAGE_SIZE
+        for i, (item, fit) in enumerate(careers, start=start + 1):
             st.markdown(f"### {i}. {item['emoji']} {item['career']}")
-            st.write(f"**추천 학과:** {item['dept']}")
+            st.caption(f"적합도 {fit:.0%} · 추천 유형 {', '.join(item['types'])}")
+            st.write(f"**추천 학과:** {'·'.join(item['departments'])}")
             st.write(f"**적합한 성격 특징:** {item['personality']}")
             st.write("---")
+        st.number_input(f"페이지 (총 {pages}쪽)", min_value=1, max_value=pages, key="career_page")
     else:
         st.warning("해당 유형의 데이터가 준비 중입니다.")
 
+with st.expander("🔎 조건으로 진로 찾기"):
+    pattern = st.text_input("성향 패턴 (예: xNTx — x는 아무 글자)", value="xNTx")
+    department = st.selectbox("학과로 찾기", ["(전체)"] + content.departments)
+    try:
+        found = content.careers_for(pattern, None if department == "(전체)" else department)
+    except ValueError as e:
+        st.warning(str(e))
+        found = []
+    for item in found:
+        st.write(f"- {item['emoji']} **{item['career']}** ({', '.join(item['types'])}) — {'·'.join(item['departments'])}")
+    if not found:
+        st.caption("조건에 맞는 진로가 없습니다.")
+
 st.caption("※ 본 정보는 MBTI 일반 경향에 기반한 진로 가이드이며, 실제 진로 선택 시에는 경험, 역량, 가치관 등을 함께 고려해야 합니다.")
 
 
@@ -1,119 +1,27 @@
 import streamlit as st
 
+from datasets import dataset
+
 st.title("🎯 MBTI별 중복 없는 책 & 영화 추천!")
 st.write("너의 MBTI를 선택하고 버튼을 누르면, 딱 맞는 추천을 보여줄게 😎")
 
-# MBTI별 추천 (중복 없이 실제 작품)
-mbti_recommendations = {
-    "INTJ": {
-        "books": [("1984", "미래 사회와 전략적 사고를 탐구하고 싶은 너에게 🕵️‍♂️"),
-                  ("해리 포터와 마법사의 돌", "창의적이고 계획적인 모험을 즐기는 너에게 ⚡")],
-        "movies": [("인셉션", "복잡한 플롯과 전략적 사고를 즐길 수 있어 🌀"),
-                   ("인터스텔라", "과학과 탐험을 좋아하는 너에게 🚀")]
-    },
-    "INTP": {
-        "books": [("호모 데우스", "미래와 기술에 호기심 많은 너에게 🤖"),
-                  ("셜록 홈즈 전집", "논리와 추리를 즐기는 너에게 🔍")],
-        "movies": [("매트릭스", "새로운 관점에서 세상을 보고 싶다면 👓"),
-                   ("소셜 네트워크", "아이디어와 혁신에 관심 있는 너에게 💻")]
-    },
-    "ENTJ": {
-        "books": [("총균쇠", "역사와 전략적 사고를 즐기는 너에게 📜"),
-                  ("리더의 조건", "리더십과 전략을 배우고 싶은 너에게 🏹")],
-        "movies": [("글래디에이터", "도전과 전략이 필요한 이야기 ⚔️"),
-                   ("킹스맨", "리더십과 액션을 즐기는 너에게 🕶")]
-    },
-    "ENTP": {
-        "books": [("모모", "창의적이고 호기심 많은 너에게 🎭"),
-                  ("퍼시 잭슨과 번개 도둑", "모험과 재미를 즐기는 너에게 ⚡")],
-        "movies": [("아이언맨", "발명과 도전을 즐기는 너에게 💡"),
-                   ("주토피아", "새로운 세상을 탐험하고 싶다면 🐰")]
-    },
-    "INFJ": {
-        "books": [("연금술사", "꿈과 인생의 의미를 찾고 싶은 너에게 ✨"),
-                  ("작은 아씨들", "섬세하고 따뜻한 마음을 가진 너에게 🌸")],
-        "movies": [("이터널 선샤인", "감정과 내면을 깊이 느끼고 싶다면 💭"),
-                   ("어바웃 타임", "사랑과 인생을 생각하게 하는 영화 💖")]
-    },
-    "INFP": {
-        "books": [("호밀밭의 파수꾼", "자유로운 영혼과 감성을 가진 너에게 🌿"),
-                  ("이상한 나라의 앨리스", "상상력과 꿈을 즐기는 너에게 🐇")],
-        "movies": [("월-E", "감성과 따뜻한 메시지를 좋아한다면 🤖"),
-                   ("소울", "마음의 여정을 즐기고 싶다면 🎷")]
-    },
-    "ENFJ": {
-        "books": [("굿 투 그레이트", "사람들과 함께 성장하고 싶은 너에게 🌟"),
-                  ("위대한 개츠비", "사회와 관계에 관심 많은 너에게 🏙")],
-        "movies": [("굿 윌 헌팅", "영감을 주고 싶어하는 너에게 🎓"),
-                   ("인사이드 아웃", "감정과 관계를 이해하고 싶다면 😊")]
-    },
-    "ENFP": {
-        "books": [("찰리와 초콜릿 공장", "재미와 창의력을 즐기고 싶다면 🍫"),
-                  ("소년탐정정 김전일", "모험과 상상력을 즐기는 너에게 🕵️‍♂️")],
-        "movies": [("업", "모험과 감동을 좋아한다면 🎈"),
-                   ("라라랜드", "꿈과 열정을 즐기는 너에게 🎶")]
-    },
-    "ISTJ": {
-        "books": [("아틀라스 쇼러그드", "논리와 계획을 좋아하는 너에게 📚"),
-                  ("죽음의 수용소에서", "질서와 현실적 사고를 배우고 싶다면 ⚖️")],
-        "movies": [("셜록 홈즈", "추리와 계획을 좋아한다면 🕵️‍♂️"),
-                   ("셜로카드", "체계적이고 전략적인 이야기를 즐기고 싶다면 🧩")]
-    },
-    "ISFJ": {
-        "books": [("안나 카레니나", "따뜻한 마음과 배려심을 가진 너에게 ❤️"),
-                  ("연금술사", "조용히 삶의 의미를 찾고 싶다면 ✨")],
-        "movies": [("어바웃 타임", "사랑과 가족을 소중히 생각하는 너에게 💖"),
-                   ("굿바이 크리스마스", "따뜻한 감성을 즐기고 싶다면 🎄")]
-    },
-    "ESTJ": {
-        "books": [("리더의 조건", "조직과 목표 달성을 좋아하는 너에게 🏹"),
-                  ("총균쇠", "전략적 사고를 즐기는 너에게 📜")],
-        "movies": [("글래디에이터", "도전과 책임감을 느끼고 싶다면 ⚔️"),
-                   ("킹스맨", "효율적이고 활동적인 리더에게 🕶")]
-    },
-    "ESFJ": {
-        "books": [("작은 아씨들", "사람들과 관계를 중요하게 생각하는 너에게 🌸"),
-                  ("위대한 개츠비", "사회와 관계에 관심 많은 너에게 🏙")],
-        "movies": [("인사이드 아웃", "감정을 이해하고 표현하고 싶다면 😊"),
-                   ("인턴", "사람들과 협력하며 즐겁게 일하고 싶다면 👔")]
-    },
-    "ISTP": {
-        "books": [("모험가의 일기", "실용적이고 도전적인 활동을 좋아한다면 🗺"),
-                  ("셜록 홈즈 전집", "논리적 문제 해결과 실용적 사고를 즐긴다면 🔍")],
-        "movies": [("매트릭스", "독립적이고 전략적 문제 해결을 좋아한다면 👓"),
-                   ("제이슨 본", "빠르고 실용적인 액션을 즐기는 너에게 🏃‍♂️")]
-    },
-    "ISFP": {
-        "books": [("이상한 나라의 앨리스", "감각적이고 자유로운 영혼을 가진 너에게 🐇"),
-                  ("호밀밭의 파수꾼", "자유와 감성을 즐기고 싶다면 🌿")],
-        "movies": [("월-E", "감성과 따뜻한 메시지를 좋아한다면 🤖"),
-                   ("비긴 어게인", "음악과 감성을 즐기고 싶다면 🎸")]
-    },
-    "ESTP": {
-        "books": [("퍼시 잭슨과 번개 도둑", "모험과 빠른 판단을 즐기는 활동적인 너에게 ⚡"),
-                  ("다빈치 코드", "추리와 액션을 좋아하는 너에게 🖋")],
-        "movies": [("아이언맨", "액션과 모험을 즐기는 너에게 ⚡"),
-                   ("포켓몬스터: 뮤츠의 역습", "빠른 판단과 활동을 즐기고 싶다면 🔥")]
-    },
-    "ESFP": {
-        "books": [("찰리와 초콜릿 공장", "재미와 모험을 좋아하는 너에게 🍫"),
-                  ("모모", "상상력과 감각을 즐기고 싶다면 🎨")],
-        "movies": [("라라랜드", "꿈과 열정을 즐기는 너에게 🎶"),
-                   ("인사이드 아웃", "감정과 관계를 즐기고 싶다면 😊")]
-    }
-}
+# MBTI별 추천 (중복 없이 실제 작품) — 공용 콘텐츠 파일에서 프로세스당 한 번만 읽는다
+content = dataset("content")
 
 # MBTI 선택
-mbti_choice = st.selectbox("너의 MBTI를 선택해봐요:", list(mbti_recommendations.keys()))
+mbti_choice = st.selectbox("너의 MBTI를 선택해봐요:", content.work_types)
 
-# 추천 보기 버튼
+# 추천 보기 버튼 (페이지를 넘기는 동안 결과가 유지되도록 세션에 기억)
 if st.button("추천 보기 🎯"):
-    if mbti_choice:
-        st.subheader("📚 책 추천")
-        for book, reason in mbti_recommendations[mbti_choice]["books"]:
-            st.write(f"- **{book}**: {reason}")
+    st.session_state["work_mbti"] = mbti_choice
 
-        st.subheader("🎬 영화 추천")
-        for movie, reason in mbti_recommendations[mbti_choice]["movies"]:
-            st.write(f"- **{movie}**: {reason}")
-            
+if mbti_choice and st.session_state.get("work_mbti") == mbti_choice:
+    # 유형과 겹치는 축이 많은 작품부터 (종류별 순위는 콘텐츠 저장소에 미리 정렬됨)
+    for kind, header in (("책", "📚 책 추천"), ("영화", "🎬 영화 추천")):
+        st.subheader(header)
+        page = st.session_state.get(f"work_page_{kind}", 1)
+        items, pages = content.ranked_works(mbti_choice, kind, page)
+        for item, fit in items:
+            st.write(f"- **{item['title']}**: {content.reason_for(item, mbti_choice, fit)} _(적합도 {fit:.0%})_")
+        if pages > 1:
+            st.number_input(f"{kind} 페이지 (총 {pages}쪽)", min_value=1, max_value=pages, key=f"work_page_{kind}")
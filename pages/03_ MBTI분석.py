@@ -1,12 +1,12 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 
-# ===== 데이터 불러오기 =====
-@st.cache_data
-def load_data():
-    df = pd.read_csv("countriesMBTI_16types.csv")
-    return df
+from datasets import dataset_snapshot
+from figure_cache import cached_figure
+from mbti_charts import (
+    axis_figure, cluster_map_figure, country_figure, country_tab_figure, similar_figure, similarity_heatmap, type_top_figure,
+)
+from mbti_data import AXES, TOP_COUNTRIES
 
 # ===== 기본 설정 =====
 st.set_page_config(page_title="세계 MBTI 비율 대시보드", page_icon="🌍", layout="wide")
@@ -14,196 +14,75 @@ st.title("🌍 세계 MBTI 비율 대시보드")
 
 st.markdown("#### 국가를 선택하면 각 MBTI 유형의 비율을 확인할 수 있습니다.")
 
-# ===== 데이터 로드 =====
-df = load_data()
+# ===== 데이터 로드 (인코딩 판별·float32 파싱·Parquet 스냅샷은 공통 로더가 처리) =====
+# 국가별 정렬 순서·유형별 국가 순위·네 축 비율은 한 번만 계산해 공유 (공용 레지스트리)
+matrix, mbti_version = dataset_snapshot("mbti")
+df = matrix.frame
 
 # ===== 사이드바 =====
 st.sidebar.header("국가 선택")
-selected_country = st.sidebar.selectbox("국가를 선택하세요", df['Country'].unique())
-
-# ===== 선택한 국가 데이터 가공 =====
-country_data = df[df['Country'] == selected_country].melt(id_vars='Country', var_name='MBTI', value_name='비율')
-country_data = country_data.sort_values('비율', ascending=False)
-
-# ===== 색상 설정 =====
-top_type = country_data.iloc[0]['MBTI']
-colors = ['#FF4C4C' if mbti == top_type else f'rgba(0, 123, 255, {0.4 + 0.6*(1 - i/len(country_data))})' for i, mbti in enumerate(country_data['MBTI'])]
-
-# ===== 그래프 =====
-fig = px.bar(
-    country_data,
-    x='MBTI',
-    y='비율',
-    text='비율',
-    title=f"{selected_country}의 MBTI 비율",
-)
-
-fig.update_traces(
-    texttemplate='%{text:.2%}',
-    textposition='outside',
-    marker_color=colors
-)
-fig.update_layout(
-    yaxis_tickformat='.0%',
-    template='plotly_white',
-    xaxis_title='MBTI 유형',
-    yaxis_title='비율',
-    showlegend=False
-)
-
-# ===== 출력 =====
-st.plotly_chart(fig, use_container_width=True)
-
-# ===== 데이터 보기 =====
-with st.expander("📄 원본 데이터 보기"):
-    st.dataframe(df)
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import numpy as np
-
-# 예시 데이터 (사용자 데이터로 교체 가능)
-data = {
-    'Country': ['South Korea', 'USA', 'Japan', 'Germany', 'France', 'UK', 'Canada', 'Brazil', 'India', 'Australia', 'Italy'],
-    'INTJ': [8, 6, 7, 5, 6, 7, 6, 5, 4, 6, 5],
-    'ENFP': [10, 12, 9, 8, 9, 10, 11, 7, 6, 9, 8],
-    'ISTP': [7, 5, 8, 6, 7, 6, 5, 4, 6, 5, 7],
-    'INFJ': [9, 8, 7, 6, 5, 6, 7, 5, 4, 5, 6],
-}
-df = pd.DataFrame(data)
-
-st.title("🌍 MBTI 세계 비교 대시보드")
-
-tab1, tab2 = st.tabs(["국가별 MBTI 비율", "MBTI별 국가 순위"])
-
-# ------------------------------
-# 📊 탭 1: 국가별 MBTI 비율
-# ------------------------------
-with tab1:
-    st.subheader("국가별 MBTI 비율 비교")
-
-    country = st.selectbox("국가를 선택하세요:", df['Country'].unique())
+selected_country = st.sidebar.selectbox("국가를 선택하세요", matrix.countries)
 
-    # 해당 국가 데이터 추출
-    row = df[df['Country'] == country].iloc[0]
-    mbti_values = row[1:]
-    mbti_df = pd.DataFrame({
-        'MBTI': mbti_values.index,
-        'Value': mbti_values.values
-    }).sort_values('Value', ascending=False)
+# ===== 선택한 국가 데이터 (미리 정렬된 순서로 바로 꺼냄) =====
+country_data = matrix.country_profile(selected_country)
 
-    # 색상 설정 (1등은 빨강, 나머지는 파랑 그라데이션 역방향)
-    colors = ['red'] + px.colors.sequential.Blues[::-1][:len(mbti_df)-1]
+# ===== 그래프 (순위별 색은 국가와 무관) =====
+st.plotly_chart(cached_figure("mbti/country", (selected_country,), mbti_version, lambda: country_figure(country_data, selected_country)), use_container_width=True)
 
-    fig = px.bar(
-        mbti_df,
-        x='MBTI',
-        y='Value',
-        text='Value',
-        color=mbti_df['MBTI'],
-        color_discrete_sequence=colors
-    )
-    fig.update_traces(textposition='outside')
-    fig.update_layout(
-        showlegend=False,
-        yaxis_title="비율(%)",
-        xaxis_title="MBTI 유형",
-        title=f"{country}의 MBTI 비율",
-    )
+# ===== 유형·성향별 국가 순위 =====
+st.markdown("#### 🏆 전체 국가 순위")
 
-    st.plotly_chart(fig, use_container_width=True)
-
-# ------------------------------
-# 📊 탭 2: MBTI별 국가 순위
-# ------------------------------
-with tab2:
-    st.subheader("MBTI별 국가 비율 상위 10개")
+lb_col1, lb_col2 = st.columns(2)
 
-    mbti_type = st.selectbox("MBTI 유형을 선택하세요:", df.columns[1:])
+with lb_col1:
+    lb_type = st.selectbox("MBTI 유형", matrix.types, index=int(matrix.country_orders[matrix.country_index[selected_country], 0]))
+    type_board = matrix.type_leaderboard(lb_type, 10)
+    rank = int(matrix.type_ranks[matrix.type_index[lb_type], matrix.country_index[selected_country]])
+    st.caption(f"{selected_country}: {lb_type} 비율 {len(matrix.countries)}개국 중 **{rank}위**")
+    st.dataframe(type_board.style.format({'비율': '{:.2%}'}), hide_index=True, use_container_width=True)
 
-    sorted_df = df.sort_values(by=mbti_type, ascending=False)
-    top10 = sorted_df.head(10)
+with lb_col2:
+    lb_letter = st.radio("성향", [letter for pair in AXES for letter in pair], horizontal=True)
+    axis_board = matrix.axis_leaderboard(lb_letter, 10)
+    st.caption(f"{lb_letter} 성향 비율이 높은 국가 Top 10")
+    st.dataframe(axis_board.style.format({'비율': '{:.2%}'}), hide_index=True, use_container_width=True)
 
-    # South Korea 포함 확인
-    if 'South Korea' not in top10['Country'].values:
-        sk_row = df[df['Country'] == 'South Korea']
-        top10 = pd.concat([top10, sk_row])
+axis_data = matrix.axis_profile(selected_country)
+st.plotly_chart(cached_figure("mbti/axis", (selected_country,), mbti_version, lambda: axis_figure(axis_data, selected_country)), use_container_width=True)
 
-    # 색상 설정
-    colors = []
-    for country in top10['Country']:
-        if country == 'South Korea':
-            colors.append('rgb(180, 60, 180)')  # 보라톤 (빨+파 믹스)
-        else:
-            colors.append('rgb(0, 100, 255)')
+# ===== 성격 분포가 비슷한 국가 (거리 행렬·순서는 한 번만 계산됨) =====
+st.markdown(f"#### 🧭 {selected_country}와(과) MBTI 분포가 비슷한 국가")
 
-    fig2 = px.bar(
-        top10,
-        x='Country',
-        y=mbti_type,
-        text=mbti_type,
-        color='Country',
-        color_discrete_sequence=colors
-    )
+sim_col1, sim_col2 = st.columns([1, 2])
 
-    fig2.update_traces(textposition='outside')
-    fig2.update_layout(
-        showlegend=False,
-        yaxis_title="비율(%)",
-        xaxis_title="국가",
-        title=f"{mbti_type} 유형 비율이 높은 국가 Top 10",
-    )
+with sim_col1:
+    similar_df = matrix.similar_countries(selected_country, 10)
+    st.dataframe(similar_df.style.format({'유사도': '{:.3f}'}), hide_index=True, use_container_width=True)
 
-    st.plotly_chart(fig2, use_container_width=True)
-    import streamlit as st
-import pandas as pd
-import plotly.express as px
+with sim_col2:
+    compare_countries = [selected_country] + similar_df['Country'].head(3).tolist()
+    st.plotly_chart(cached_figure("mbti/sim", (selected_country,), mbti_version,
+                                  lambda: similar_figure(matrix, compare_countries, country_data['MBTI'])), use_container_width=True)
 
-# ------------------------------
-# 🌏 MBTI 예시 데이터 생성
-# ------------------------------
+# ===== 국가 군집 지도 (계층 군집을 k개로 자르기만 함) =====
+st.markdown("#### 🗺️ MBTI 분포 기준 국가 군집")
 
-countries = [
-    "Afghanistan","Albania","Algeria","Andorra","Angola","Antigua and Barbuda",
-    "Argentina","Armenia","Australia","Austria","Azerbaijan","Bahamas","Bahrain",
-    "Bangladesh","Barbados","Belarus","Belgium","Belize","Bhutan",
-    "Bosnia and Herzegovina","Botswana","Brazil","Brunei","Bulgaria","Burkina Faso",
-    "Cambodia","Cameroon","Canada","Chile","China","Colombia","Congo","Costa Rica",
-    "Croatia","Cuba","Cyprus","Czech Republic","Congo (Kinshasa)","Denmark","Djibouti",
-    "Dominica","Dominican Republic","Ecuador","Egypt","El Salvador","Estonia","Ethiopia",
-    "Faroe Islands","Fiji","Finland","France","Georgia","Germany","Ghana","Greece",
-    "Grenada","Guatemala","Guinea","Guyana","Haiti","Honduras","Hungary","Iceland",
-    "India","Indonesia","Iraq","Ireland","Israel","Italy","Jamaica","Japan","Jordan",
-    "Kazakhstan","Kenya","Kuwait","Kyrgyzstan","Laos","Latvia","Lebanon","Lesotho",
-    "Libya","Lithuania","Luxembourg","Madagascar","Malawi","Malaysia","Maldives","Mali",
-    "Malta","Mauritius","Mexico","Monaco","Mongolia","Montenegro","Morocco","Mozambique",
-    "Myanmar","Namibia","Nepal","Netherlands","New Zealand","Nicaragua","Niger","Nigeria",
-    "Macedonia","Norway","Oman","Pakistan","Panama","Papua New Guinea","Paraguay","Peru",
-    "Philippines","Poland","Portugal","Qatar","South Korea","Moldova","Romania","Russia",
-    "Rwanda","Saint Kitts and Nevis","Saint Lucia","Saint Vincent and the Grenadines",
-    "Saudi Arabia","Senegal","Serbia","Seychelles","Singapore","Slovakia","Slovenia",
-    "Somalia","South Africa","Spain","Sri Lanka","Sudan","Suriname","Sweden","Switzerland",
-    "Syria","Tajikistan","Thailand","Trinidad and Tobago","Tunisia","Turkey","Uganda",
-    "Ukraine","United Arab Emirates","United Kingdom","Tanzania","United States","Uruguay",
-    "Uzbekistan","Vanuatu","Vietnam","Yemen","Zambia","Zimbabwe"
-]
+num_clusters = st.slider("군집 개수", min_value=2, max_value=10, value=5)
+cluster_df, cluster_summary = matrix.clusters(num_clusters)
 
-# MBTI 유형 예시
-mbti_types = ['INTJ','ENFP','ISTP','INFJ','ENTP','ISFJ','ESTJ','ESFP','ISTJ','INFP','ENFJ','ISFP','ESTP','ENTJ','ESFJ','INTP']
+st.plotly_chart(cached_figure("mbti/map", (num_clusters,), mbti_version, lambda: cluster_map_figure(cluster_df, cluster_summary, num_clusters)), use_container_width=True)
+st.dataframe(cluster_summary, hide_index=True, use_container_width=True)
 
-# 임의 데이터 생성 (실제 데이터로 교체 가능)
-import numpy as np
-np.random.seed(42)
-data = {'Country': countries}
-for mbti in mbti_types:
-    data[mbti] = np.random.randint(1, 20, size=len(countries))
+with st.expander("🔥 국가 간 유사도 히트맵 (군집 순서)"):
+    st.plotly_chart(cached_figure("mbti/heat", (), mbti_version, lambda: similarity_heatmap(matrix)), use_container_width=True)
 
-df = pd.DataFrame(data)
+# ===== 데이터 보기 =====
+with st.expander("📄 원본 데이터 보기"):
+    st.dataframe(df)
 
-# ------------------------------
-# 🌍 Streamlit 대시보드
-# ------------------------------
-st.title("🌍 MBTI 세계 비교 대시보드")
+# ===== 국가별 / MBTI별 비교 탭 (같은 캐시 데이터 사용) =====
+st.markdown("---")
+st.header("🌍 MBTI 세계 비교")
 
 tab1, tab2 = st.tabs(["국가별 MBTI 비율", "MBTI별 국가 순위"])
 
@@ -213,77 +92,27 @@ tab1, tab2 = st.tabs(["국가별 MBTI 비율", "MBTI별 국가 순위"])
 with tab1:
     st.subheader("국가별 MBTI 비율 비교")
 
-    country = st.selectbox("국가를 선택하세요:", df['Country'].unique())
-    row = df[df['Country'] == country].iloc[0]
-    mbti_values = row[1:]
-    mbti_df = pd.DataFrame({
-        'MBTI': mbti_values.index,
-        'Value': mbti_values.values
-    }).sort_values('Value', ascending=False)
-
-    # 색상 설정 (1등 빨강, 나머지 파랑 그라데이션 역방향)
-    colors = ['red'] + px.colors.sequential.Blues[::-1][:len(mbti_df)-1]
-
-    fig = px.bar(
-        mbti_df,
-        x='MBTI',
-        y='Value',
-        text='Value',
-        color=mbti_df['MBTI'],
-        color_discrete_sequence=colors
-    )
-    fig.update_traces(textposition='outside')
-    fig.update_layout(
-        showlegend=False,
-        yaxis_title="비율(%)",
-        xaxis_title="MBTI 유형",
-        title=f"{country}의 MBTI 비율",
-    )
+    country = st.selectbox("국가를 선택하세요:", matrix.countries, index=matrix.country_index[selected_country])
+    mbti_df = matrix.country_profile(country)
 
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(cached_figure("mbti/tab1", (country,), mbti_version, lambda: country_tab_figure(mbti_df, country)), use_container_width=True)
 
 # ------------------------------
 # 📊 탭 2: MBTI별 국가 순위
 # ------------------------------
 with tab2:
-    st.subheader("MBTI별 국가 비율 상위 10개")
-
-    mbti_type = st.selectbox("MBTI 유형을 선택하세요:", mbti_types)
-
-    sorted_df = df.sort_values(by=mbti_type, ascending=False)
-    top10 = sorted_df.head(10)
-
-    # South Korea 포함 확인
-    if 'South Korea' not in top10['Country'].values:
-        sk_row = df[df['Country'] == 'South Korea']
-        top10 = pd.concat([top10, sk_row])
-
-    # 파란색 그라데이션 (역방향)
-    min_val, max_val = top10[mbti_type].min(), top10[mbti_type].max()
-    def blue_gradient(value):
-        norm = (max_val - value) / (max_val - min_val) if max_val != min_val else 0
-        return f"rgba(0, 0, 255, {0.3 + 0.7*norm})"
-
-    colors = top10[mbti_type].apply(blue_gradient).tolist()
-    # South Korea는 보라색
-    colors = [c if country != 'South Korea' else 'rgba(180,60,180,1)' for c, country in zip(colors, top10['Country'])]
+    st.subheader(f"MBTI별 국가 비율 상위 {TOP_COUNTRIES}개")
 
-    fig2 = px.bar(
-        top10,
-        x='Country',
-        y=mbti_type,
-        text=mbti_type,
-        color=top10['Country'],
-        color_discrete_sequence=colors
-    )
+    mbti_type = st.selectbox("MBTI 유형을 선택하세요:", matrix.types)
 
-    fig2.update_traces(textposition='outside')
-    fig2.update_layout(
-        showlegend=False,
-        yaxis_title="비율(%)",
-        xaxis_title="국가",
-        title=f"{mbti_type} 유형 비율이 높은 국가 Top 10",
-    )
+    # 유형별 Top N은 미리 만들어 둔 표를 그대로 사용
+    top10 = matrix.type_tops[mbti_type]
 
-    st.plotly_chart(fig2, use_container_width=True)
+    # 선택 국가가 Top N 밖이면 순위와 함께 덧붙임
+    if selected_country not in top10['Country'].values:
+        j, i = matrix.type_index[mbti_type], matrix.country_index[selected_country]
+        extra = pd.DataFrame({'순위': [int(matrix.type_ranks[j, i])], 'Country': [selected_country], '비율': [matrix.values[i, j]]})
+        top10 = pd.concat([top10, extra], ignore_index=True)
 
+    st.plotly_chart(cached_figure("mbti/tab2", (mbti_type, selected_country), mbti_version,
+                                  lambda: type_top_figure(top10, mbti_type, selected_country)), use_container_width=True)
@@ -1,67 +1,94 @@
 
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import numpy as np
+
+from datasets import dataset_snapshot
+from chart_render import PAGE_SIZE, RENDER_TOP_N, page_slice, top_with_others
+from figure_cache import cached_figure
+from subway_charts import day_type_figure, rank_figure, trend_figure
+from subway_data import PERIODS, get_station_ranking, get_trend_rollups
 
 # 페이지 설정
-st.set_page_config(page_title="🚇 2025년 10월 지하철 승하차 분석", layout="wide")
+st.set_page_config(page_title="🚇 지하철 승하차 분석", layout="wide")
 
 # 제목
-st.title("🚇 2025년 10월 지하철 승하차 분석")
-st.write("날짜와 호선을 선택하면, 승·하차 총합 기준으로 역 순위를 시각화합니다.")
+st.title("🚇 지하철 승하차 분석")
+st.write("월·날짜와 호선을 선택하면, 승·하차 총합 기준으로 역 순위를 시각화합니다. 추세 보기에서는 노선·역별 기간 추이를 볼 수 있습니다.")
+
+# 새로 들어온 월별 CSV만 저장소에 적재된 월 목록 (적재·최근 월 색인은 공용 레지스트리가 미리 해 둠)
+subway, subway_version = dataset_snapshot("subway")
+months = list(subway.months)
+if not months:
+    st.error("적재된 지하철 데이터가 없습니다. data/subway 폴더에 월별 CSV를 넣어주세요.")
+    st.stop()
+
+
+def month_label(m):
+    return f"{m // 100}년 {m % 100}월"
+
+
+mode = st.radio("🔎 보기 방식", ["일별 순위", "추세"], horizontal=True)
+
+# ===== 추세 보기: 적재 시 계산해 둔 롤업 색인을 기간으로 잘라 사용 =====
+if mode == "추세":
+    start_month, end_month = st.select_slider(
+        "🗓️ 기간을 선택하세요",
+        options=months,
+        value=(months[max(0, len(months) - 12)], months[-1]),
+        format_func=month_label,
+    )
+    trends = get_trend_rollups(subway.store_dir)
 
-# 데이터 불러오기
-df = pd.read_csv("jijonsik.csv", encoding="cp949")
-df['사용일자'] = df['사용일자'].astype(str)
+    level = st.radio("단위", ["노선", "역"], horizontal=True)
+    name = st.selectbox(f"🚉 {level}을 선택하세요", trends.names[level])
+    period = st.radio("주기", list(PERIODS), format_func=PERIODS.get, horizontal=True)
+    window = st.slider(f"이동평균 구간 ({PERIODS[period]} 수)", min_value=1, max_value=30, value=7 if period == "D" else 1)
 
-# 날짜 선택 (10월만)
-october_dates = sorted(df[df['사용일자'].str.startswith("202510")]['사용일자'].unique())
-selected_date = st.selectbox("📅 날짜를 선택하세요", october_dates)
+    series = trends.series(level, name, period, start_month, end_month)
+    if series.empty:
+        st.warning("선택한 기간에 데이터가 없습니다.")
+        st.stop()
+
+    st.plotly_chart(cached_figure("subway/trend", (start_month, end_month, level, name, period, window), subway_version,
+                                  lambda: trend_figure(series, name, period, window)), use_container_width=True)
+
+    # 평일/주말 하루 평균 비교
+    split = trends.day_type_split(level, name, start_month, end_month)
+    st.plotly_chart(cached_figure("subway/split", (start_month, end_month, level, name), subway_version,
+                                  lambda: day_type_figure(split, name)), use_container_width=True)
+    st.stop()
+
+# ===== 일별 순위 보기 =====
+# 월 선택 — 선택한 월의 파티션만 읽는다
+selected_month = st.selectbox("🗓️ 월을 선택하세요", months[::-1], format_func=month_label)
+ranking = get_station_ranking(selected_month, subway.store_dir)
+
+# 날짜 선택 (사용일자는 YYYYMMDD 정수)
+selected_date = st.selectbox("📅 날짜를 선택하세요", ranking.dates)
 
 # 호선 선택
-selected_line = st.selectbox("🚈 호선을 선택하세요", sorted(df['노선명'].unique()))
+selected_line = st.selectbox("🚈 호선을 선택하세요", ranking.lines)
 
-# 필터링
-filtered = df[(df['사용일자'] == selected_date) & (df['노선명'] == selected_line)].copy()
+# (날짜, 호선) 색인 조회 — 총승객 계산과 내림차순 정렬은 색인 생성 시 완료
+filtered = ranking.lookup(selected_date, selected_line)
 
 if filtered.empty:
     st.warning("선택한 날짜와 호선에 데이터가 없습니다.")
 else:
-    # 승·하차 합산
-    filtered["총승객"] = filtered["승차총승객수"] + filtered["하차총승객수"]
-
-    # 총승객 기준 내림차순 정렬
-    filtered = filtered.sort_values("총승객", ascending=False).reset_index(drop=True)
-
-    # 색상 설정: 1등 빨강, 나머지는 파란색 그라데이션
-    n = len(filtered)
-    colors = ["red"]
-    if n > 1:
-        blue_colors = px.colors.sequential.Blues  # Plotly 기본 블루 계열
-        # n-1개에 맞춰 균등 분할
-        indices = np.linspace(0, len(blue_colors)-1, n-1, dtype=int)
-        colors += [blue_colors[i] for i in indices]
-
-    # 그래프
-    fig = px.bar(
-        filtered,
-        x="역명",
-        y="총승객",
-        title=f"📊 {selected_date} / {selected_line} 승하차 총합 순위",
-        color_discrete_sequence=colors,
-        text="총승객"  # 막대 위 숫자 표시
-    )
-
-    fig.update_layout(
-        xaxis_title="역명",
-        yaxis_title="승차+하차 총합",
-        template="plotly_white",
-        title_font=dict(size=24, family="Arial Black"),
-        xaxis_tickangle=-45
-    )
+    # 역이 많은 노선은 상위 N개 + '기타' 막대로, 전체는 페이지 단위로만 보낸다
+    view = "상위"
+    page = 1
+    if len(filtered) > RENDER_TOP_N:
+        view = st.radio("📏 표시 방식", ["상위", "전체"], horizontal=True,
+                        format_func=lambda v: f"상위 {RENDER_TOP_N}개 + 기타" if v == "상위" else f"전체 ({PAGE_SIZE}개씩)")
+    if view == "상위":
+        plot_df = top_with_others(filtered[["역명", "총승객"]], "역명", "총승객")
+    else:
+        page = st.number_input("페이지", min_value=1, max_value=-(-len(filtered) // PAGE_SIZE), value=1)
+        plot_df, _ = page_slice(filtered, page)
 
-    st.plotly_chart(fig, use_container_width=True)
+    # 그래프 (같은 월·날짜·호선·표시 범위면 색상 계산과 그림 생성·직렬화 없이 캐시에서)
+    st.plotly_chart(cached_figure("subway/rank", (selected_month, selected_date, selected_line, view, page), subway_version,
+                                  lambda: rank_figure(plot_df, selected_date, selected_line)), use_container_width=True)
 
     # 상위 5개 역 테이블 표시
     st.subheader("🏆 상위 5개 역")
@@ -1,51 +1,40 @@
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+
+from crime_charts import (
+    crime_regions_figure, district_rank_figure, major_detail_figure, profile_figure, province_crimes_figure,
+    province_districts_figure, province_rank_figure, top_crimes_figure, yearly_growth_figure, yearly_total_figure,
+)
+from crime_data import COUNT, CRIME_CSV, CRIME_DIR, POPULATION_CSV, load_year_cube
+from datasets import dataset_snapshot
+from chart_render import PAGE_SIZE, page_slice, top_with_others
+from figure_cache import cached_figure
 
 # --- 1. Streamlit 페이지 설정 및 데이터 로드 ---
 
 st.set_page_config(layout="wide", page_title="🕵️ 범죄 발생 현황 심층 분석 대시보드")
-st.title("🚨 2023년 지역별 범죄 발생 심층 분석 🗺️")
-st.caption("👈 분석을 시작하려면 왼쪽 사이드바에서 설정을 확인해주세요!")
-
-# 데이터 로드 함수 (Streamlit 캐싱 적용)
-@st.cache_data
-def load_data(file_path):
-    """CSV 파일을 로드하고 필요한 전처리를 수행합니다."""
-    encodings = ['cp949', 'euc-kr', 'utf-8']
-    df = None
-    for encoding in encodings:
-        try:
-            df = pd.read_csv(file_path, encoding=encoding)
-            break
-        except:
-            continue
-    
-    if df is None:
-        raise Exception("파일을 로드할 수 없습니다. 인코딩을 확인해주세요.")
-
-    # '범죄대분류', '범죄중분류' 열을 제외한 나머지가 구 이름 열입니다.
-    col_to_convert = df.columns.drop(['범죄대분류', '범죄중분류'])
-    df[col_to_convert] = df[col_to_convert].apply(pd.to_numeric, errors='coerce').fillna(0).astype(int)
-    
-    return df
 
-# 파일 경로 및 데이터 로드
-FILE_PATH = "경찰청_범죄 발생 지역별 통계_20231231.csv"
+# 파일 경로 및 데이터 로드 (루트의 CSV와 data/crime 폴더의 연도별 CSV를 한 저장소로)
+FILE_PATH = CRIME_CSV
 
 try:
-    data_df = load_data(FILE_PATH)
+    store, crime_version = dataset_snapshot("crime")
+    # 분석 연도 (기본값: 가장 최근 연도)
+    selected_year = st.sidebar.selectbox("📅 분석 연도", options=store.years[::-1], index=0)
+    cube = load_year_cube(store, selected_year)
 except FileNotFoundError:
-    st.error(f"🚨 파일을 찾을 수 없습니다: **{FILE_PATH}**. 파일을 루트 폴더에 업로드했는지 확인해주세요.")
+    st.error(f"🚨 파일을 찾을 수 없습니다: **{FILE_PATH}**. 파일을 루트 폴더(또는 '{CRIME_DIR}' 폴더)에 업로드했는지 확인해주세요.")
     st.stop()
 except Exception as e:
     st.error(f"데이터 로드 및 처리 중 오류가 발생했습니다: {e}")
     st.stop()
 
+st.title(f"🚨 {selected_year}년 지역별 범죄 발생 심층 분석 🗺️")
+st.caption("👈 분석을 시작하려면 왼쪽 사이드바에서 설정을 확인해주세요!")
+
 # 구 이름 목록 추출
-all_districts = data_df.columns.drop(['범죄대분류', '범죄중분류']).tolist()
+all_districts = cube.districts
 
 
 # --- 2. 사이드바 설정 (사용자 입력) ---
@@ -69,9 +58,19 @@ with st.sidebar:
     )
     
     top_n = int(top_n) 
+
+    # 3. 지표 선택 (인구·면적 표가 있으면 비율 지표 추가)
+    st.subheader("3️⃣ 비교 지표")
+    metric = st.radio("지표", options=cube.metric_names, index=0)
+    if len(cube.totals) == 1:
+        st.caption(f"'{POPULATION_CSV}' (지역, 인구, 면적_km2)를 넣으면 인구 10만명당·km²당 지표가 추가됩니다.")
+    # 입지계수처럼 지역 합계가 의미 없는 지표는 순위표에서 건수를 사용
+    rank_metric = metric if metric in cube.totals else COUNT
     
     st.markdown("---")
-    st.caption("데이터 출처: 경찰청 (2023년 범죄 발생 지역별 통계)")
+    st.caption(f"데이터 출처: 경찰청 ({selected_year}년 범죄 발생 지역별 통계)")
+    if len(store.years) == 1:
+        st.caption(f"'{CRIME_DIR}' 폴더에 다른 연도의 CSV(파일 이름 끝에 YYYYMMDD)를 넣으면 전년 대비 증감이 표시됩니다.")
 
 
 # --- 3. 데이터 분석 및 시각화 (선택 구역의 Top N) ---
@@ -80,75 +79,159 @@ if selected_district:
     
     st.header(f"✨ {selected_district} 분석 결과")
     
-    # 총 범죄 건수 및 Top N 계산
-    crime_data = data_df[['범죄중분류', '범죄대분류', selected_district]].copy()
-    grouped_crime = crime_data.groupby('범죄중분류')[selected_district].sum().reset_index()
-    sorted_crime = grouped_crime.sort_values(by=selected_district, ascending=False)
-    total_crime_count = sorted_crime[selected_district].sum()
-    top_n_crime = sorted_crime.head(top_n)
+    # 총 범죄 건수 및 Top N (큐브에 미리 계산된 합계·정렬 순서를 잘라 쓴다)
+    total_crime_count = int(cube.district_totals[cube.district_index[selected_district]])
+    # 전년 대비 증감은 저장소에 미리 계산됨 (전년 자료가 없으면 NaN)
+    _, yoy_delta, yoy_growth = store.district_yoy(selected_year, selected_district)
+    top_n_crime = cube.top_crimes(selected_district, top_n, metric)
 
     col1, col2 = st.columns([1, 2])
     
     with col1:
         st.subheader("총 발생 건수 🔢")
-        st.metric(label=f"**{selected_district}** 총 범죄 건수 (2023년)", value=f"{total_crime_count:,} 건", delta="연간 합계")
+        if pd.isna(yoy_delta):
+            # 앞선 연도는 있는데 바로 전년이 빠진 경우는 비교하지 않는다 (2년치 변화를 전년 대비로 보이지 않도록)
+            gap = store.years[0] < selected_year and (selected_year - 1) not in store.year_index
+            note = f"{selected_year - 1}년 자료 없음" if gap else "연간 합계"
+            st.metric(label=f"**{selected_district}** 총 범죄 건수 ({selected_year}년)", value=f"{total_crime_count:,} 건", delta=note, delta_color="off")
+        else:
+            growth_text = "" if pd.isna(yoy_growth) else f" ({yoy_growth:+.1%})"
+            # 범죄는 줄어드는 쪽이 좋은 변화이므로 색을 반대로
+            st.metric(
+                label=f"**{selected_district}** 총 범죄 건수 ({selected_year}년)",
+                value=f"{total_crime_count:,} 건",
+                delta=f"{yoy_delta:+,.0f} 건{growth_text} 전년 대비",
+                delta_color="inverse",
+            )
+        if rank_metric != COUNT:
+            rate = cube.totals[rank_metric][cube.district_index[selected_district]]
+            st.metric(label=f"{rank_metric} 범죄 건수", value=f"{rate:,.1f} 건")
 
     with col2:
         # Plotly 막대 그래프 생성 (Top N)
         if not top_n_crime.empty:
-            fig_topn = px.bar(
-                top_n_crime,
-                x=selected_district,
-                y='범죄중분류',
-                orientation='h',
-                title=f"🥇 **{selected_district}** 범죄 발생 건수 Top {top_n} 유형",
-                labels={selected_district: '발생 건수 (건)', '범죄중분류': '범죄 유형'},
-                color=selected_district, 
-                color_continuous_scale=px.colors.sequential.Plotly3,
-            )
-            fig_topn.update_layout(yaxis={'categoryorder': 'total ascending'}, height=450)
-            st.plotly_chart(fig_topn, use_container_width=True)
+            st.plotly_chart(cached_figure("crime/topn", (selected_year, selected_district, top_n, metric), crime_version,
+                                          lambda: top_crimes_figure(top_n_crime, selected_district, top_n, metric)), use_container_width=True)
         else:
             st.warning("선택하신 지역에 대한 데이터가 부족합니다.")
 
 st.markdown("---")
 
+# --- 3-0. 연도별 추이 (여러 해의 자료가 있을 때) ---
+
+if len(store.years) > 1:
+    st.header(f"📆 {selected_district} 연도별 범죄 추이")
+    series_df = store.district_series(selected_district)
+
+    col_y1, col_y2 = st.columns(2)
+
+    with col_y1:
+        st.plotly_chart(cached_figure("crime/years", (selected_district,), crime_version,
+                                      lambda: yearly_total_figure(series_df, selected_district)), use_container_width=True)
+
+    with col_y2:
+        st.plotly_chart(cached_figure("crime/growth", (selected_district,), crime_version,
+                                      lambda: yearly_growth_figure(series_df, selected_district)), use_container_width=True)
+
+    st.markdown("---")
+
+# --- 3-1. 범죄 양상이 비슷한 지역 (유사도 이웃은 큐브에 미리 계산됨) ---
+
+st.header(f"🧭 {selected_district}와(과) 범죄 양상이 비슷한 지역")
+
+# 미리 계산된 이웃 수까지만 고를 수 있다 (지역이 적은 자료에서는 슬라이더 범위를 줄이거나 생략)
+max_similar = min(20, cube.neighbours.shape[1])
+if max_similar == 0:
+    st.info("비교할 다른 지역이 없습니다.")
+else:
+    if max_similar > 3:
+        similar_n = st.slider("보여줄 유사 지역 개수", min_value=3, max_value=max_similar, value=min(10, max_similar))
+    else:
+        similar_n = max_similar
+    similar_df = cube.similar_districts(selected_district, similar_n)
+
+    col_s1, col_s2 = st.columns([1, 2])
+
+    with col_s1:
+        st.dataframe(similar_df.style.format({'유사도': '{:.3f}'}), hide_index=True, use_container_width=True)
+
+    with col_s2:
+        # 선택 지역과 가장 비슷한 3곳의 범죄 유형 구성비 비교 (선택 지역 기준 상위 유형)
+        profile = cube.crime_profile([selected_district] + similar_df['지역'].head(3).tolist())
+        # 비교 대상은 유사 지역 상위 3곳이라 슬라이더 값과 무관
+        st.plotly_chart(cached_figure("crime/profile", (selected_year, selected_district, top_n), crime_version,
+                                      lambda: profile_figure(profile, selected_district, top_n)), use_container_width=True)
+
+st.markdown("---")
+
 # --- 4. 추가 기능 1: 지역별 총 범죄 건수 비교 랭킹 (수정됨) ---
 
 st.header("📈 지역별 범죄 발생량 비교 랭킹")
 
-# 1. 지역별 총 범죄 건수 계산
-total_crime_by_district = data_df[all_districts].sum().reset_index()
-total_crime_by_district.columns = ['지역', '총_범죄_건수']
-total_crime_by_district = total_crime_by_district.sort_values(by='총_범죄_건수', ascending=False).reset_index(drop=True)
-total_crime_by_district['순위'] = total_crime_by_district.index + 1
+# 1. 지역별 총 범죄 건수 순위
+total_crime_by_district = cube.district_ranking(rank_metric)
 
 # 2. 선택 지역의 순위 찾기
-selected_rank = total_crime_by_district[total_crime_by_district['지역'] == selected_district]['순위'].iloc[0]
+selected_rank = int(cube.district_ranks[rank_metric][cube.district_index[selected_district]])
 
-st.info(f"선택하신 **{selected_district}**의 총 범죄 발생 건수는 전체 지역 중 **{selected_rank}위** 입니다.")
+st.info(f"선택하신 **{selected_district}**의 총 범죄 발생 건수({rank_metric})는 전체 지역 중 **{selected_rank}위** 입니다.")
 
-# 3. 랭킹 시각화: 슬라이더 기본값을 10으로 설정
-comparison_n = st.slider(
-    "비교하여 보여줄 지역 개수", 
-    min_value=10, # 최소값을 10으로 고정
-    max_value=len(all_districts), 
-    value=10, # 기본값을 10으로 설정
-    step=5
-)
+# 3. 랭킹 시각화: 상위 N개 + '기타' 막대가 기본, 나머지 지역은 순위 페이지로 나눠 보낸다
+rank_view = st.radio("표시 방식", ["상위 N + 기타", f"순위 페이지 ({PAGE_SIZE}곳씩)"], horizontal=True)
+
+if rank_view == "상위 N + 기타":
+    comparison_n = st.slider(
+        "비교하여 보여줄 지역 개수", 
+        min_value=10, # 최소값을 10으로 고정
+        max_value=min(50, len(all_districts)), 
+        value=10, # 기본값을 10으로 설정
+        step=5
+    )
+    # 입지계수처럼 합계가 의미 없는 지표는 나머지 지역 평균으로 묶는다
+    rank_plot_df = top_with_others(total_crime_by_district, '지역', '총_범죄_건수', comparison_n, how="sum" if rank_metric == COUNT else "mean")
+    rank_title = f"전국 지역별 총 범죄 건수({rank_metric}) Top {comparison_n} 순위"
+else:
+    # 선택 지역이 있는 페이지부터
+    rank_page = st.number_input(
+        "순위 페이지",
+        min_value=1,
+        max_value=-(-len(all_districts) // PAGE_SIZE),
+        value=(selected_rank - 1) // PAGE_SIZE + 1,
+    )
+    rank_plot_df, _ = page_slice(total_crime_by_district, rank_page)
+    rank_title = f"전국 지역별 총 범죄 건수({rank_metric}) {(rank_page - 1) * PAGE_SIZE + 1}~{(rank_page - 1) * PAGE_SIZE + len(rank_plot_df)}위"
+
+st.plotly_chart(cached_figure("crime/rank", (selected_year, selected_district, rank_metric, rank_title), crime_version,
+                              lambda: district_rank_figure(rank_plot_df, selected_district, rank_metric, rank_title)), use_container_width=True)
+
+st.markdown("---")
 
-fig_rank = px.bar(
-    total_crime_by_district.head(comparison_n),
-    x='총_범죄_건수',
-    y='지역',
-    orientation='h',
-    title=f"전국 지역별 총 범죄 건수 Top {comparison_n} 순위",
-    color='지역',
-    color_discrete_map={selected_district: 'red'}, # 선택한 지역 강조
-    labels={'총_범죄_건수': '총 범죄 건수 (건)', '지역': '지역'},
+# --- 4-1. 시도 → 시군구 드릴다운 (시도별 집계는 큐브에 미리 계산됨) ---
+
+st.header("🗺️ 시도별 드릴다운")
+
+province_rank_df = cube.province_ranking(rank_metric)
+highlight_province = cube.provinces[cube.province_codes[cube.district_index[selected_district]]]
+st.plotly_chart(cached_figure("crime/province", (selected_year, selected_district, rank_metric), crime_version,
+                              lambda: province_rank_figure(province_rank_df, highlight_province, rank_metric)), use_container_width=True)
+
+selected_province = st.selectbox(
+    "자세히 볼 **시도**를 선택하세요.",
+    options=cube.provinces,
+    index=int(cube.province_codes[cube.district_index[selected_district]]),
 )
-fig_rank.update_layout(yaxis={'categoryorder': 'total ascending'}, height=max(500, comparison_n * 30))
-st.plotly_chart(fig_rank, use_container_width=True)
+
+col_p1, col_p2 = st.columns(2)
+
+with col_p1:
+    province_districts = cube.province_districts(selected_province, rank_metric)
+    st.plotly_chart(cached_figure("crime/local", (selected_year, selected_province, selected_district, rank_metric), crime_version,
+                                  lambda: province_districts_figure(province_districts, selected_province, selected_district, rank_metric)), use_container_width=True)
+
+with col_p2:
+    province_crimes = cube.province_top_crimes(selected_province, top_n, metric)
+    st.plotly_chart(cached_figure("crime/province_crime", (selected_year, selected_province, top_n, metric), crime_version,
+                                  lambda: province_crimes_figure(province_crimes, selected_province, top_n, metric)), use_container_width=True)
 
 st.markdown("---")
 
@@ -170,36 +253,22 @@ with tabs[0]: # 📊 대분류 내 세부 비교
     )
 
     if selected_sub_crime:
-        major_category_row = data_df[data_df['범죄중분류'] == selected_sub_crime].head(1)
-        if not major_category_row.empty:
-            major_category = major_category_row['범죄대분류'].iloc[0]
+        if selected_sub_crime in cube.crime_index:
+            major_category = cube.major_of(selected_sub_crime)
             
             st.info(f"선택 유형 '**{selected_sub_crime}**'는 **'{major_category}'**에 속합니다.")
 
-            detail_data = data_df[data_df['범죄대분류'] == major_category].copy()
-            detail_grouped = detail_data.groupby('범죄중분류')[selected_district].sum().reset_index()
-            detail_grouped = detail_grouped.sort_values(by=selected_district, ascending=False)
+            detail_grouped = cube.major_detail(major_category, selected_district, metric)
             
-            fig_detail = px.bar(
-                detail_grouped,
-                x=selected_district,
-                y='범죄중분류',
-                orientation='h',
-                title=f"'{major_category}' 대분류 내 중분류별 건수 비교",
-                labels={selected_district: '발생 건수 (건)', '범죄중분류': '범죄 유형'},
-                color=selected_district, 
-                color_continuous_scale=px.colors.sequential.Agsunset,
-            )
-            
-            fig_detail.update_layout(yaxis={'categoryorder': 'total ascending'}, height=max(400, len(detail_grouped) * 35))
-            st.plotly_chart(fig_detail, use_container_width=True)
+            st.plotly_chart(cached_figure("crime/detail", (selected_year, major_category, selected_district, metric), crime_version,
+                                          lambda: major_detail_figure(detail_grouped, major_category, selected_district, metric)), use_container_width=True)
 
 
 with tabs[1]: # 🌎 유형별 지역 비교
     
     st.subheader("2️⃣ 특정 범죄 유형의 지역별 비교")
 
-    all_crime_types = data_df['범죄중분류'].unique()
+    all_crime_types = cube.crime_types
 
     compare_crime = st.selectbox(
         "비교할 **범죄 유형 (중분류)**을 선택하세요.",
@@ -207,23 +276,15 @@ with tabs[1]: # 🌎 유형별 지역 비교
         index=0 
     )
 
+    compare_scope = st.selectbox(
+        "비교 범위 (시도)",
+        options=["전국"] + cube.provinces,
+        index=0
+    )
+
     if compare_crime:
-        compare_data_row = data_df[data_df['범죄중분류'] == compare_crime].copy()
-        
-        compare_df = compare_data_row[all_districts].T.sum(axis=1).reset_index()
-        compare_df.columns = ['지역', '발생_건수']
-        compare_df = compare_df.sort_values(by='발생_건수', ascending=False)
-
-        # Top 20만 표시
-        fig_comp = px.bar(
-            compare_df.head(20), 
-            x='발생_건수',
-            y='지역',
-            orientation='h',
-            title=f"**{compare_crime}** 발생 건수 지역별 비교 (Top 20)",
-            color='지역',
-            color_discrete_map={selected_district: '#0077b6'}, 
-            labels={'발생_건수': '발생 건수 (건)', '지역': '지역'},
-        )
-        fig_comp.update_layout(yaxis={'categoryorder': 'total ascending'}, height=600)
-        st.plotly_chart(fig_comp, use_container_width=True)
+        # Top 20만 표시 (지역 순위는 큐브에 미리 정렬되어 있음)
+        compare_df = cube.regions_for(compare_crime, 20, metric, None if compare_scope == "전국" else compare_scope)
+
+        st.plotly_chart(cached_figure("crime/comp", (selected_year, compare_crime, compare_scope, selected_district, metric), crime_version,
+                                      lambda: crime_regions_figure(compare_df, compare_crime, compare_scope, selected_district, metric)), use_container_width=True)
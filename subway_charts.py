@@ -0,0 +1,67 @@
+import numpy as np
+import plotly.express as px
+
+from chart_render import render_mode
+from subway_data import PERIODS
+
+# 지하철 페이지 그림 — 페이지는 cached_figure로 감싸 부르고, benchmark.py도 같은 함수를 잰다
+
+
+def rank_figure(plot_df, date, line):
+    """(날짜, 호선) 역 순위 막대 그래프 (1등 빨강, 나머지는 파란색 그라데이션)."""
+    n = len(plot_df)
+    colors = ["red"]
+    if n > 1:
+        blue_colors = px.colors.sequential.Blues  # Plotly 기본 블루 계열
+        # n-1개에 맞춰 균등 분할
+        indices = np.linspace(0, len(blue_colors)-1, n-1, dtype=int)
+        colors += [blue_colors[i] for i in indices]
+
+    fig = px.bar(
+        plot_df,
+        x="역명",
+        y="총승객",
+        title=f"📊 {date} / {line} 승하차 총합 순위",
+        color_discrete_sequence=colors,
+        text="총승객"  # 막대 위 숫자 표시
+    )
+
+    fig.update_layout(
+        xaxis_title="역명",
+        yaxis_title="승차+하차 총합",
+        template="plotly_white",
+        title_font=dict(size=24, family="Arial Black"),
+        xaxis_tickangle=-45
+    )
+    return fig
+
+
+def trend_figure(series, name, period, window):
+    """기간별 승하차 총합 추이 (window > 1이면 이동평균 선을 함께)."""
+    trend = series[["총승객"]].copy()
+    if window > 1:
+        trend[f"{window}{PERIODS[period]} 이동평균"] = trend["총승객"].rolling(window, min_periods=1).mean()
+
+    fig_trend = px.line(
+        trend,
+        x=trend.index,
+        y=trend.columns,
+        title=f"📈 {name} {PERIODS[period]}별 승하차 총합 추이",
+        markers=period != "D",
+        render_mode=render_mode(trend.size),  # 긴 기간의 일별 추이는 WebGL로
+    )
+    fig_trend.update_layout(xaxis_title="기간", yaxis_title="승차+하차 총합", legend_title="", template="plotly_white")
+    return fig_trend
+
+
+def day_type_figure(split, name):
+    """월별 평일·주말 하루 평균 승하차 비교 막대 그래프."""
+    fig_split = px.bar(
+        split,
+        x=split.index,
+        y=split.columns,
+        barmode="group",
+        title=f"🗓️ {name} 월별 평일·주말 하루 평균 승하차",
+    )
+    fig_split.update_layout(xaxis_title="월", yaxis_title="하루 평균 승차+하차", legend_title="", template="plotly_white")
+    return fig_split
@@ -0,0 +1,463 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from data_loader import SUBWAY_CSV, SUBWAY_DTYPES, sniff_encoding, temp_store_dir
+
+# 순위 표에 쓰는 열
+RANK_COLUMNS = ["역명", "승차총승객수", "하차총승객수", "총승객"]
+
+# 월별 CSV(cp949/utf-8)를 넣어 두는 폴더와, 월 단위로 분할 저장되는 Parquet 저장소
+# (원본별 조각은 parts/, 페이지가 읽는 월 파일·롤업은 갱신마다 새로 만드는 버전 폴더 v<N>/)
+SUBWAY_DIR = os.path.join("data", "subway")
+SUBWAY_STORE = "subway_store"
+MANIFEST_NAME = "_manifest.json"
+PARTS_DIR = "parts"
+MONTH_FILE = "data.parquet"
+ROLLUP_DIR = "rollup"
+
+# 저장소 구조 번호 (매니페스트와 다르면 저장소를 비우고 처음부터 적재)
+STORE_LAYOUT = 3
+
+# 공개된 버전 폴더를 최근 몇 개까지 남길지 (직전 버전을 읽던 세션이 끝까지 읽을 수 있도록)
+KEEP_VERSIONS = 2
+
+# 같은 날짜·노선·역은 한 번만 센다 (여러 원본에 겹쳐 있으면 앞선 원본 우선)
+ROW_KEY = ["사용일자", "노선명", "역명"]
+
+# 한 번에 메모리에 올리는 최대 행 수 (이력이 길어져도 적재 메모리는 일정)
+CHUNK_ROWS = 200_000
+
+# 청크는 문자열로 읽고, 범주형 변환은 여러 파티션을 합친 뒤에 한다
+_CHUNK_DTYPES = {**SUBWAY_DTYPES, "노선명": "str", "역명": "str"}
+
+_ingest_lock = threading.Lock()
+
+
+# ===== 월별 분할 저장소 적재 =====
+def subway_source_files(source_dir=SUBWAY_DIR):
+    """적재 대상 CSV 목록 — 우선순위 순서 (폴더의 월별 파일, 마지막에 기본 jijonsik.csv)."""
+    files = sorted(glob.glob(os.path.join(source_dir, "*.csv")))
+    if os.path.exists(SUBWAY_CSV):
+        files.append(SUBWAY_CSV)
+    return files
+
+
+def _read_manifest(store_dir):
+    try:
+        with open(os.path.join(store_dir, MANIFEST_NAME), encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(store_dir, manifest):
+    path = os.path.join(store_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _ingest_file(csv_path, store_dir):
+    """CSV 하나를 청크 단위로 읽어 원본별 월 조각(parts/)으로 씁니다."""
+    key = hashlib.md5(os.path.normpath(csv_path).encode("utf-8")).hexdigest()[:10]
+    parts = []
+    reader = pd.read_csv(
+        csv_path,
+        encoding=sniff_encoding(csv_path),
+        usecols=list(SUBWAY_DTYPES),
+        dtype=_CHUNK_DTYPES,
+        chunksize=CHUNK_ROWS,
+    )
+    for chunk_no, chunk in enumerate(reader):
+        for month, part in chunk.groupby(chunk["사용일자"] // 100, sort=False):
+            rel_path = os.path.join(PARTS_DIR, f"month={month}", f"{key}-{chunk_no:05d}.parquet")
+            path = os.path.join(store_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            part.to_parquet(path, index=False)
+            parts.append(rel_path)
+    return parts
+
+
+def _remove_parts(store_dir, parts):
+    # 조각을 지우고, 영향받은 월을 돌려준다
+    for rel_path in parts:
+        try:
+            os.remove(os.path.join(store_dir, rel_path))
+        except FileNotFoundError:
+            pass
+    return {_month_of_part(p) for p in parts}
+
+
+def _write_month(target_dir, month, part_lists, parts_root):
+    """원본 순서대로 한 달치 조각을 합치고 중복 행을 걸러 월 파일 하나로 씁니다."""
+    files = [os.path.join(parts_root, p) for parts in part_lists for p in parts if _month_of_part(p) == month]
+    df = pd.concat((pd.read_parquet(f) for f in files), ignore_index=True)
+    # jijonsik.csv와 월별 파일에 같은 달이 겹쳐도 두 번 세지 않는다
+    df = df.drop_duplicates(ROW_KEY, keep="first")
+    month_dir = os.path.join(target_dir, f"month={month}")
+    os.makedirs(month_dir, exist_ok=True)
+    df.to_parquet(os.path.join(month_dir, MONTH_FILE), index=False)
+
+
+def _link_month(previous_dir, target_dir, month):
+    """바뀌지 않은 달의 월 파일·롤업을 이전 버전에서 새 버전으로 하드 링크합니다 (안 되면 복사)."""
+    for src in (os.path.join(previous_dir, f"month={month}", MONTH_FILE), _rollup_path(previous_dir, month)):
+        dst = os.path.join(target_dir, os.path.relpath(src, previous_dir))
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+
+def _version_dir(store_dir, version):
+    return os.path.join(store_dir, f"v{version}")
+
+
+def published_dir(store_dir=SUBWAY_STORE):
+    """지금 공개된 버전 폴더 (페이지는 이 폴더만 읽는다) — 아직 없으면 None."""
+    version = _read_manifest(store_dir).get("published")
+    return None if version is None else _version_dir(store_dir, version)
+
+
+def _publish(store_dir, manifest, touched_months, part_lists):
+    # 새 버전 폴더를 끝까지 만든 뒤 매니페스트의 공개 버전만 바꾼다 (os.replace라 원자적)
+    published = manifest.get("published")
+    previous = None if published is None else _version_dir(store_dir, published)
+    staged = {_month_of_part(p) for parts in part_lists for p in parts}
+    if previous is not None and not touched_months and staged == set(available_months(previous)):
+        return
+
+    version = (published or 0) + 1
+    target = _version_dir(store_dir, version)
+    shutil.rmtree(target, ignore_errors=True)  # 지난번에 공개 전에 멈춘 버전
+    os.makedirs(target)
+    reusable = set() if previous is None else set(available_months(previous)) - touched_months
+    for month in sorted(staged):
+        if month in reusable and os.path.exists(_rollup_path(previous, month)):
+            _link_month(previous, target, month)
+        else:
+            # 바뀐 달만 다시 합치고 롤업을 계산 (한 번에 한 달치만 메모리에)
+            _write_month(target, month, part_lists, store_dir)
+            _write_rollup(target, month)
+    manifest["published"] = version
+    _write_manifest(store_dir, manifest)
+
+    # 교체 뒤에만 오래된 버전을 지운다 (직전 버전은 남겨 실행 중인 세션이 계속 읽게 함)
+    for name in os.listdir(store_dir):
+        if name.startswith("v") and name[1:].isdigit() and int(name[1:]) <= version - KEEP_VERSIONS:
+            shutil.rmtree(os.path.join(store_dir, name), ignore_errors=True)
+
+
+def ingest(sources, store_dir=SUBWAY_STORE):
+    """바뀐 CSV만 적재하고 사라진 CSV의 조각은 지운 뒤, 바뀐 달만 다시 쓴 새 버전을 공개합니다.
+
+    sources는 우선순위 순서 — 같은 날짜·노선·역이 여러 원본에 있으면 앞선 원본의 값을 씁니다.
+    공개된 버전 폴더는 고치지 않으므로, 이전 버전을 읽던 세션은 갱신 중에도 온전한 자료를 봅니다.
+    적재한 파일 목록을 돌려줍니다.
+    """
+    with _ingest_lock:
+        os.makedirs(store_dir, exist_ok=True)
+        manifest = _read_manifest(store_dir)
+        if manifest.get("layout") != STORE_LAYOUT:
+            # 예전 구조의 저장소는 비우고 처음부터 적재
+            for name in os.listdir(store_dir):
+                path = os.path.join(store_dir, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            manifest = {"layout": STORE_LAYOUT, "sources": {}}
+        entries = manifest["sources"]
+        keys = [os.path.normpath(p) for p in sources]
+
+        # 사라진 원본은 기록과 조각을 지운다 (조각은 공개 버전이 아니라 적재용이라 바로 지워도 된다)
+        touched_months = set()
+        for key in [k for k in entries if k not in keys]:
+            touched_months |= _remove_parts(store_dir, entries.pop(key)["parts"])
+        if touched_months:
+            _write_manifest(store_dir, manifest)
+
+        ingested = []
+        for csv_path, key in zip(sources, keys):
+            stat = os.stat(csv_path)
+            entry = entries.get(key)
+            if entry and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size:
+                continue
+
+            # 바뀐 파일은 예전 조각을 지우고 다시 적재
+            if entry:
+                touched_months |= _remove_parts(store_dir, entry["parts"])
+            parts = _ingest_file(csv_path, store_dir)
+            entries[key] = {"mtime": stat.st_mtime, "size": stat.st_size, "parts": parts}
+            # 파일마다 기록해 두어 중간에 멈춰도 다음 실행에서 이어서 적재
+            _write_manifest(store_dir, manifest)
+            ingested.append(csv_path)
+            touched_months |= {_month_of_part(p) for p in parts}
+
+        _publish(store_dir, manifest, touched_months, [entries[k]["parts"] for k in keys if k in entries])
+        return ingested
+
+
+def sync_store(source_dir=SUBWAY_DIR, store_dir=SUBWAY_STORE):
+    """원본 폴더와 저장소를 맞추고, 공개된 버전 폴더를 돌려줍니다 (저장소에 쓸 수 없으면 임시 폴더에서)."""
+    sources = subway_source_files(source_dir)
+    try:
+        ingest(sources, store_dir)
+    except OSError:
+        # 읽기 전용 배포 환경: 같은 구조로 임시 폴더에 만든다
+        store_dir = temp_store_dir(store_dir)
+        ingest(sources, store_dir)
+    return published_dir(store_dir)
+
+
+class SubwaySnapshot:
+    """페이지가 읽는 저장소 버전 폴더와 그 안의 월 목록 (공용 레지스트리 핸들, 버전 폴더는 공개 후 바뀌지 않음)."""
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.months = tuple(available_months(store_dir))
+
+
+# ===== 월 파티션 조회 =====
+def available_months(store_dir=SUBWAY_STORE):
+    """저장소에 있는 월(YYYYMM) 목록 — 폴더 이름만 보고 데이터는 읽지 않습니다."""
+    if not os.path.isdir(store_dir):
+        return []
+    return sorted(
+        int(name.split("=", 1)[1])
+        for name in os.listdir(store_dir)
+        if name.startswith("month=")
+    )
+
+
+def _month_of_part(rel_path):
+    return int(os.path.dirname(rel_path).split("=", 1)[1])
+
+
+def _partition_files(store_dir, month):
+    path = os.path.join(store_dir, f"month={month}", MONTH_FILE)
+    return [path] if os.path.exists(path) else []
+
+
+def partition_version(month, store_dir=SUBWAY_STORE):
+    """파티션 조각들의 (이름, 수정 시각) — 캐시 키로 사용합니다."""
+    return tuple((os.path.basename(f), os.path.getmtime(f)) for f in _partition_files(store_dir, month))
+
+
+def load_months(months, store_dir=SUBWAY_STORE):
+    """선택한 월 파티션만 읽어 하나의 표로 합칩니다."""
+    files = [f for month in months for f in _partition_files(store_dir, month)]
+    if not files:
+        return pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in SUBWAY_DTYPES.items()})
+    df = pd.concat((pd.read_parquet(f) for f in files), ignore_index=True)
+    return df.astype(SUBWAY_DTYPES)
+
+
+# ===== (사용일자, 노선명) 역 순위 색인 =====
+class StationRanking:
+    """(사용일자, 노선명)별로 총승객 내림차순 정렬된 역 순위를 미리 만들어 둔 색인."""
+
+    def __init__(self, df):
+        ranked = df.assign(총승객=df["승차총승객수"].astype("int64") + df["하차총승객수"])
+        ranked = ranked.sort_values(
+            ["사용일자", "노선명", "총승객"], ascending=[True, True, False], kind="stable"
+        ).reset_index(drop=True)
+
+        dates = ranked["사용일자"].to_numpy()
+        codes = ranked["노선명"].cat.codes.to_numpy()
+        lines = ranked["노선명"].cat.categories
+
+        # 정렬된 행에서 (날짜, 노선)이 바뀌는 지점이 각 그룹의 경계
+        boundaries = np.flatnonzero((dates[1:] != dates[:-1]) | (codes[1:] != codes[:-1])) + 1
+        starts = np.r_[0, boundaries] if len(ranked) else np.array([], dtype=int)
+        stops = np.r_[boundaries, len(ranked)] if len(ranked) else np.array([], dtype=int)
+
+        self._spans = {
+            (int(dates[start]), lines[codes[start]]): (int(start), int(stop))
+            for start, stop in zip(starts, stops)
+        }
+        self.frame = ranked[RANK_COLUMNS]
+        self.dates = sorted({date for date, _ in self._spans})
+        self.lines = sorted({line for _, line in self._spans})
+
+    def lookup(self, date, line):
+        """선택한 날짜·노선의 역 순위를 O(1) 조회로 돌려줍니다 (없으면 빈 표)."""
+        start, stop = self._spans.get((date, line), (0, 0))
+        ranking = self.frame.iloc[start:stop].reset_index(drop=True)
+        ranking["역명"] = ranking["역명"].astype(str)
+        return ranking
+
+
+@st.cache_resource(show_spinner="역 순위 색인을 만드는 중...", max_entries=12)
+def _station_ranking_cached(store_dir, month, version):
+    # version은 캐시 키로만 쓰인다 (파티션이 바뀌면 색인을 다시 만든다)
+    return StationRanking(load_months([month], store_dir))
+
+
+def get_station_ranking(month, store_dir):
+    """버전 폴더(store_dir)의 월 파티션 하나로 만든 역 순위 색인을 모든 세션이 공유합니다 (최근 12개월분만 유지)."""
+    return _station_ranking_cached(store_dir, month, partition_version(month, store_dir))
+
+
+
+# ===== 추세용 사전 집계 (롤업) =====
+ROLLUP_VALUES = ["승차", "하차", "총승객", "일수"]
+
+# 주기 코드: 일/주(월요일 시작)/월 합계, 월별 평일·주말 합계
+PERIODS = {"D": "일", "W": "주", "M": "월"}
+DAY_TYPES = {"WD": "평일", "WE": "주말"}
+
+
+def _rollup_path(store_dir, month):
+    return os.path.join(store_dir, ROLLUP_DIR, f"month={month}.parquet")
+
+
+def build_rollup(month_df):
+    """한 달치 원본으로 노선·역별 일/주/월 합계와 평일/주말 합계를 계산합니다."""
+    day = pd.to_datetime(month_df["사용일자"].astype(str), format="%Y%m%d")
+    base = pd.DataFrame({
+        "노선": month_df["노선명"].astype(str),
+        "역": month_df["역명"].astype(str),
+        "날짜": day,
+        "승차": month_df["승차총승객수"].astype("int64"),
+        "하차": month_df["하차총승객수"].astype("int64"),
+    })
+    base["총승객"] = base["승차"] + base["하차"]
+
+    frames = []
+    for level in ("노선", "역"):
+        # 역은 여러 노선에 걸쳐 있으므로 날짜별로 먼저 합친다
+        daily = base.groupby([level, "날짜"])[["승차", "하차", "총승객"]].sum().reset_index()
+        daily["일수"] = 1
+        weekday = daily["날짜"].dt.weekday
+        month_start = daily["날짜"].dt.to_period("M").dt.start_time
+        starts = {
+            "D": daily["날짜"],
+            "W": daily["날짜"] - pd.to_timedelta(weekday, unit="D"),
+            "M": month_start,
+        }
+        for period, start in starts.items():
+            frames.append(_sum_by(daily, level, period, start))
+        day_type = np.where(weekday >= 5, "WE", "WD")
+        for code in DAY_TYPES:
+            mask = day_type == code
+            frames.append(_sum_by(daily[mask], level, code, month_start[mask]))
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def _sum_by(daily, level, period, start):
+    rolled = daily.groupby([daily[level], start.rename("시작일")])[ROLLUP_VALUES].sum().reset_index()
+    rolled = rolled.rename(columns={level: "이름"})
+    rolled.insert(0, "구분", level)
+    rolled.insert(1, "주기", period)
+    return rolled
+
+
+def _write_rollup(store_dir, month):
+    # 공개 전의 새 버전 폴더에만 쓴다
+    path = _rollup_path(store_dir, month)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    build_rollup(load_months([month], store_dir)).to_parquet(path, index=False)
+
+
+def rollup_version(months, store_dir=SUBWAY_STORE):
+    """월 롤업 파일들의 수정 시각 — 캐시 키로 사용합니다."""
+    paths = [_rollup_path(store_dir, m) for m in months]
+    return tuple(os.path.getmtime(p) if os.path.exists(p) else None for p in paths)
+
+
+def _month_start(month):
+    return pd.Timestamp(year=month // 100, month=month % 100, day=1)
+
+
+class TrendRollups:
+    """모든 달의 롤업을 (구분, 주기, 이름, 시작일) 순으로 정렬해 두고, 시계열마다 구간만 기억하는 색인.
+
+    기간 선택은 색인을 다시 만들지 않고 series()에서 시작일로 잘라 냅니다.
+    """
+
+    def __init__(self, rollup):
+        # 월 경계에 걸친 주는 두 달의 부분합을 더해 완성한다 (groupby 결과는 키 순으로 정렬됨)
+        merged = rollup.groupby(["구분", "주기", "이름", "시작일"])[ROLLUP_VALUES].sum().reset_index()
+        keys = merged[["구분", "주기", "이름"]].astype(str)
+        level, period, name = (keys[c].to_numpy() for c in ("구분", "주기", "이름"))
+
+        # 정렬된 행에서 (구분, 주기, 이름)이 바뀌는 지점이 각 시계열의 경계
+        changed = (level[1:] != level[:-1]) | (period[1:] != period[:-1]) | (name[1:] != name[:-1])
+        boundaries = np.flatnonzero(changed) + 1
+        starts = np.r_[0, boundaries] if len(merged) else np.array([], dtype=int)
+        stops = np.r_[boundaries, len(merged)] if len(merged) else np.array([], dtype=int)
+
+        self._spans = {
+            (level[start], period[start], name[start]): (int(start), int(stop))
+            for start, stop in zip(starts.tolist(), stops.tolist())
+        }
+        self._starts = merged["시작일"].to_numpy()
+        self.frame = merged.set_index("시작일")[ROLLUP_VALUES]
+        self.names = {
+            lv: sorted({name for key_level, key_period, name in self._spans if key_level == lv and key_period == "M"})
+            for lv in ("노선", "역")
+        }
+
+    def _span(self, level, name, period, start_month, end_month):
+        start, stop = self._spans.get((level, period, name), (0, 0))
+        dates = self._starts[start:stop]
+        if start_month is not None:
+            lower = _month_start(start_month)
+            if period == "W":
+                lower -= pd.Timedelta(days=6)  # 선택 기간과 겹치는 주는 포함
+            start += int(np.searchsorted(dates, lower.to_datetime64(), side="left"))
+        if end_month is not None:
+            upper = _month_start(end_month) + pd.offsets.MonthBegin(1)
+            stop = start + int(np.searchsorted(self._starts[start:stop], upper.to_datetime64(), side="left"))
+        return start, stop
+
+    def series(self, level, name, period, start_month=None, end_month=None):
+        """노선/역 하나의 주기별 합계 (시작일 인덱스, 승차·하차·총승객·일수 열). 월(YYYYMM) 범위를 주면 그 기간만."""
+        start, stop = self._span(level, name, period, start_month, end_month)
+        return self.frame.iloc[start:stop]
+
+    def day_type_split(self, level, name, start_month=None, end_month=None):
+        """월별 평일·주말 하루 평균 총승객."""
+        split = {}
+        for code, label in DAY_TYPES.items():
+            rows = self.series(level, name, code, start_month, end_month)
+            split[label] = rows["총승객"] / rows["일수"]
+        return pd.DataFrame(split).sort_index()
+
+
+def load_rollups(months, store_dir=SUBWAY_STORE):
+    """선택한 월의 롤업 파일만 읽어 합칩니다."""
+    paths = [p for p in (_rollup_path(store_dir, m) for m in months) if os.path.exists(p)]
+    if not paths:
+        return pd.DataFrame(columns=["구분", "주기", "이름", "시작일", *ROLLUP_VALUES])
+    return pd.concat((pd.read_parquet(p) for p in paths), ignore_index=True)
+
+
+@st.cache_resource(show_spinner="추세 데이터를 준비하는 중...", max_entries=KEEP_VERSIONS)
+def _trend_rollups_cached(store_dir, version):
+    # version은 캐시 키로만 쓰인다 (버전 폴더마다 한 번, 기간 선택과 무관)
+    return TrendRollups(load_rollups(available_months(store_dir), store_dir))
+
+
+def get_trend_rollups(store_dir):
+    """버전 폴더(store_dir)의 모든 달을 담은 추세 색인을 모든 세션이 공유합니다 (기간은 series()에서 자름)."""
+    return _trend_rollups_cached(store_dir, rollup_version(available_months(store_dir), store_dir))
+
+
+if __name__ == "__main__":
+    # 대량 적재용: python subway_data.py [원본 폴더]
+    done = ingest(subway_source_files(*sys.argv[1:2]))
+    print(f"{len(done)}개 파일 적재 완료: {done}")
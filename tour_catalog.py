@@ -0,0 +1,81 @@
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from tour_distance import EARTH_RADIUS_KM, haversine_from
+
+# 관광지 목록 (이름, 위도, 경도, 설명, 역, 이모지)
+PLACES_CSV = "seoul_places.csv"
+
+# 격자 한 칸의 크기 (도) — 서울 위도에서 약 1.1km x 0.9km
+CELL_DEG = 0.01
+
+_KM_PER_DEG = math.pi * EARTH_RADIUS_KM / 180
+
+
+# ===== 격자 공간 색인 =====
+class PlaceCatalog:
+    """관광지 표와, 격자 칸별 장소 번호로 된 공간 색인."""
+
+    def __init__(self, df, cell_deg=CELL_DEG):
+        self.df = df.reset_index(drop=True)
+        self.lat = self.df["위도"].to_numpy(dtype=float)
+        self.lon = self.df["경도"].to_numpy(dtype=float)
+        self.cell_deg = cell_deg
+
+        rows = np.floor(self.lat / cell_deg).astype(np.int64)
+        cols = np.floor(self.lon / cell_deg).astype(np.int64)
+        order = np.lexsort((cols, rows))
+        rows, cols = rows[order], cols[order]
+        # 정렬된 칸 번호가 바뀌는 지점으로 칸별 장소 번호 묶음을 만든다
+        boundaries = np.flatnonzero((rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])) + 1
+        self._cells = {
+            (int(rows[chunk[0]]), int(cols[chunk[0]])): order[chunk]
+            for chunk in np.split(np.arange(len(order)), boundaries)
+            if len(chunk)
+        }
+
+    def _candidates(self, south, west, north, east):
+        r0, r1 = math.floor(south / self.cell_deg), math.floor(north / self.cell_deg)
+        c0, c1 = math.floor(west / self.cell_deg), math.floor(east / self.cell_deg)
+        if (r1 - r0 + 1) * (c1 - c0 + 1) > len(self._cells):
+            return np.arange(len(self.df))  # 범위가 넓으면 칸을 도는 것보다 전체가 빠르다
+        found = [
+            self._cells[(r, c)]
+            for r in range(r0, r1 + 1)
+            for c in range(c0, c1 + 1)
+            if (r, c) in self._cells
+        ]
+        return np.concatenate(found) if found else np.array([], dtype=np.int64)
+
+    def within_bbox(self, south, west, north, east):
+        """위도·경도 사각형 안의 장소."""
+        idx = self._candidates(south, west, north, east)
+        lat, lon = self.lat[idx], self.lon[idx]
+        idx = idx[(lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)]
+        return self.df.iloc[np.sort(idx)]
+
+    def within_radius(self, lat, lon, radius_km):
+        """한 지점에서 radius_km 안의 장소를 가까운 순으로 ('거리_km' 열 포함)."""
+        dlat = radius_km / _KM_PER_DEG
+        dlon = radius_km / (_KM_PER_DEG * max(math.cos(math.radians(lat)), 1e-6))
+        idx = self._candidates(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        dist = haversine_from(lat, lon, self.lat[idx], self.lon[idx])
+        keep = dist <= radius_km
+        idx, dist = idx[keep], dist[keep]
+        order = np.argsort(dist, kind="stable")
+        return self.df.iloc[idx[order]].assign(거리_km=dist[order])
+
+
+@st.cache_resource(show_spinner="관광지 목록을 불러오는 중...", max_entries=2)
+def _catalog_cached(path, mtime):
+    # mtime은 캐시 키로만 쓰인다 (파일이 바뀌면 다시 읽고 색인을 만든다)
+    return PlaceCatalog(pd.read_csv(path, encoding="utf-8"))
+
+
+def load_catalog(path=PLACES_CSV):
+    """관광지 목록과 공간 색인을 파일 수정 시각 단위로 한 번만 만들어 모든 세션이 공유합니다."""
+    return _catalog_cached(path, os.path.getmtime(path))
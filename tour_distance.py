@@ -0,0 +1,113 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+
+# 장소 간 이동 시간(분) 정방 행렬 CSV — 첫 열과 머리글이 장소 이름 (없으면 거리만 사용)
+TRAVEL_TIME_CSV = "travel_time.csv"
+
+# 시간 행렬에 없는 쌍은 도보 속도로 채운다
+WALK_KMH = 4.5
+
+CACHE_DIR = os.path.join(".cache", "tour")
+_CACHE_VERSION = "1"
+
+# 프로세스 안에서는 디스크도 다시 읽지 않도록 최근 장소 집합의 행렬을 몇 개만 더 기억 (오래 안 쓴 것부터 버림)
+MEMORY_ENTRIES = 32
+_memory = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+# ===== 대원 거리 =====
+def haversine_matrix(lat, lon):
+    """위도·경도(도) 배열로 모든 쌍의 대원 거리(km) 행렬을 한 번에 계산합니다."""
+    lat = np.radians(np.asarray(lat, dtype=float))
+    lon = np.radians(np.asarray(lon, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def haversine_from(lat, lon, lats, lons):
+    """한 지점에서 여러 지점까지의 대원 거리(km) 배열."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lons = np.radians(np.asarray(lons, dtype=float))
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def load_time_matrix(names, lat, lon, path=TRAVEL_TIME_CSV):
+    """파일의 이동 시간(분)을 장소 순서에 맞춰 읽고, 빠진 쌍은 도보 시간으로 채웁니다."""
+    table = pd.read_csv(path, index_col=0)
+    minutes = table.reindex(index=names, columns=names).to_numpy(dtype=float)
+    walk = haversine_matrix(lat, lon) / WALK_KMH * 60
+    return np.where(np.isnan(minutes), walk, minutes)
+
+
+# ===== 장소 집합 단위 디스크 캐시 =====
+def _cache_key(kind, canon):
+    digest = hashlib.sha1(f"{_CACHE_VERSION}|{kind}".encode("utf-8"))
+    for name, la, lo in canon:
+        digest.update(f"|{name}|{la:.6f}|{lo:.6f}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _cached_matrix(kind, names, lat, lon, compute, cache_dir):
+    # 장소 순서와 무관하게 같은 집합이면 같은 캐시를 쓰도록 정렬된 순서로 계산·저장
+    points = list(zip(map(str, names), map(float, lat), map(float, lon)))
+    order = sorted(range(len(points)), key=points.__getitem__)
+    canon = [points[i] for i in order]
+    key = _cache_key(kind, canon)
+
+    with _memory_lock:
+        matrix = _memory.get(key)
+        if matrix is not None:
+            _memory.move_to_end(key)
+    path = os.path.join(cache_dir, key + ".npy")
+    if matrix is None and os.path.exists(path):
+        try:
+            matrix = np.load(path)
+        except (OSError, ValueError):
+            matrix = None  # 손상된 캐시는 다시 계산
+    if matrix is None:
+        c_names, c_lat, c_lon = (list(col) for col in zip(*canon)) if canon else ([], [], [])
+        matrix = compute(c_names, c_lat, c_lon)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                np.save(f, matrix)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            pass  # 읽기 전용 배포 환경에서는 메모리 캐시만 사용
+    with _memory_lock:
+        _memory[key] = matrix
+        _memory.move_to_end(key)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+    # 정렬 순서 → 요청한 순서로 되돌리기
+    inverse = np.empty(len(order), dtype=int)
+    inverse[order] = np.arange(len(order))
+    return matrix[np.ix_(inverse, inverse)]
+
+
+def distance_matrix(names, lat, lon, cache_dir=CACHE_DIR):
+    """장소 집합의 대원 거리(km) 행렬 (디스크 캐시)."""
+    return _cached_matrix("km", names, lat, lon, lambda n, la, lo: haversine_matrix(la, lo), cache_dir)
+
+
+def travel_matrix(names, lat, lon, time_path=TRAVEL_TIME_CSV, cache_dir=CACHE_DIR):
+    """경로 계산에 쓸 비용 행렬과 단위 — 이동 시간 파일이 있으면 분, 없으면 km."""
+    if not os.path.exists(time_path):
+        return distance_matrix(names, lat, lon, cache_dir), "km"
+    # 시간 파일이 바뀌면 다른 캐시 키가 되도록 수정 시각을 포함
+    kind = f"min|{os.path.abspath(time_path)}|{os.path.getmtime(time_path)}"
+    matrix = _cached_matrix(kind, names, lat, lon, lambda n, la, lo: load_time_matrix(n, la, lo, time_path), cache_dir)
+    return matrix, "분"
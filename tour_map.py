@@ -0,0 +1,87 @@
+import folium
+import numpy as np
+import streamlit as st
+from folium.plugins import FastMarkerCluster
+
+MAP_CENTER = [37.5665, 126.9780]
+
+# 화면 안 장소가 이 개수를 넘으면 개별 마커 대신 브라우저 쪽 클러스터로 그린다
+MARKER_LIMIT = 300
+
+# 살짝 옮겨도 빈 지도가 되지 않도록 화면 범위를 이 비율만큼 넓혀서 보낸다
+VIEWPORT_PADDING = 0.25
+
+_CLUSTER_CALLBACK = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {title: row[3]});
+    marker.bindPopup(row[2]);
+    return marker;
+}
+"""
+
+
+def popup_html(df):
+    """장소마다 팝업 HTML을 열 단위 문자열 연산으로 만듭니다."""
+    return (
+        "<div style='white-space:nowrap;font-weight:bold'>"
+        + df["이모지"] + " " + df["이름"] + " - " + df["설명"] + " / " + df["역"]
+        + "</div>"
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def map_payload(df):
+    """데이터셋별로 한 번만 만드는 좌표 배열과 GeoJSON Feature 목록 (세션 간 공유, 읽기 전용)."""
+    lat = df["위도"].to_numpy(dtype=float)
+    lon = df["경도"].to_numpy(dtype=float)
+    popups = popup_html(df).tolist()
+    names = df["이름"].tolist()
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [x, y]},
+            "properties": {"popup": p, "이름": n},
+        }
+        for y, x, p, n in zip(lat.tolist(), lon.tolist(), popups, names)
+    ]
+    return lat, lon, popups, names, features
+
+
+def viewport_indices(lat, lon, bounds, padding=VIEWPORT_PADDING):
+    """st_folium이 돌려준 화면 범위(여유 포함) 안에 있는 장소 번호."""
+    if not bounds:
+        return np.arange(len(lat))
+    south, west = bounds["_southWest"]["lat"], bounds["_southWest"]["lng"]
+    north, east = bounds["_northEast"]["lat"], bounds["_northEast"]["lng"]
+    pad_lat, pad_lon = (north - south) * padding, (east - west) * padding
+    mask = (
+        (lat >= south - pad_lat) & (lat <= north + pad_lat)
+        & (lon >= west - pad_lon) & (lon <= east + pad_lon)
+    )
+    return np.flatnonzero(mask)
+
+
+def poi_layer(df, bounds=None):
+    """화면 안 장소만 담은 레이어 — 적으면 팝업 마커(GeoJSON), 많으면 FastMarkerCluster."""
+    lat, lon, popups, names, features = map_payload(df)
+    visible = viewport_indices(lat, lon, bounds)
+    layer = folium.FeatureGroup(name="관광지")
+
+    if len(visible) == 0:
+        return layer  # 빈 GeoJSON에는 툴팁·팝업 필드가 없어 렌더링 오류가 난다
+    if len(visible) <= MARKER_LIMIT:
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": [features[i] for i in visible]},
+            marker=folium.Marker(icon=folium.Icon(color="red", icon="info-sign")),
+            popup=folium.GeoJsonPopup(fields=["popup"], labels=False),
+            tooltip=folium.GeoJsonTooltip(fields=["이름"], labels=False),
+        ).add_to(layer)
+    else:
+        rows = [[lat[i], lon[i], popups[i], names[i]] for i in visible.tolist()]
+        FastMarkerCluster(rows, callback=_CLUSTER_CALLBACK).add_to(layer)
+    return layer
+
+
+def base_map():
+    """장소 레이어 없이 타일만 있는 기본 지도 (레이어만 바뀌면 지도는 다시 그리지 않음)."""
+    return folium.Map(location=MAP_CENTER, zoom_start=12)
@@ -0,0 +1,200 @@
+import time
+
+import numpy as np
+
+# 이 개수 이하면 Held-Karp DP로 정확한 최적 경로를 구한다 (2^n * n^2)
+HELD_KARP_MAX = 12
+
+# 휴리스틱 개선(2-opt / Or-opt)에 쓰는 기본 시간 예산 (초)
+TIME_BUDGET = 1.0
+
+_EPS = 1e-12
+
+
+# ===== 경로 비용 (거리 행렬은 tour_distance에서 계산) =====
+def route_length(route, dist):
+    """방문 순서대로 이동한 총 거리 (출발지로 돌아오지 않음)."""
+    route = np.asarray(route)
+    return float(dist[route[:-1], route[1:]].sum()) if len(route) > 1 else 0.0
+
+
+# ===== 정확해: Held-Karp =====
+def held_karp(dist):
+    """시작·끝이 자유로운 최단 방문 경로를 비트마스크 DP로 구합니다."""
+    n = len(dist)
+    full = (1 << n) - 1
+    nodes = np.arange(n)
+    bits = 1 << nodes
+
+    # cost[mask, j]: mask의 장소를 모두 들르고 j에서 끝나는 최소 거리
+    cost = np.full((full + 1, n), np.inf)
+    parent = np.full((full + 1, n), -1, dtype=np.int64)
+    cost[bits, nodes] = 0.0
+
+    for mask in range(1, full + 1):
+        members = nodes[(mask & bits) != 0]
+        if len(members) < 2:
+            continue
+        prev_masks = mask ^ bits[members]
+        # 후보[i, k] = (members[i]를 뺀 집합을 k에서 끝낸 비용) + k→members[i]
+        candidates = cost[prev_masks] + dist[:, members].T
+        best = candidates.argmin(axis=1)
+        cost[mask, members] = candidates[np.arange(len(members)), best]
+        parent[mask, members] = best
+
+    # 끝 지점부터 거꾸로 따라가며 경로 복원
+    last = int(cost[full].argmin())
+    route, mask = [], full
+    while last >= 0:
+        route.append(last)
+        mask, last = mask ^ (1 << last), int(parent[mask, last])
+    return route[::-1]
+
+
+# ===== 휴리스틱: 최근접 이웃 + 2-opt / Or-opt =====
+def nearest_neighbour(dist, start=0):
+    """가장 가까운 미방문 장소로 계속 이동하는 초기 경로."""
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    route = [start]
+    visited[start] = True
+    for _ in range(n - 1):
+        row = np.where(visited, np.inf, dist[route[-1]])
+        nxt = int(row.argmin())
+        route.append(nxt)
+        visited[nxt] = True
+    return route
+
+
+def _two_opt(tour, dist, deadline):
+    """순환 경로에서 구간 뒤집기로 줄어드는 만큼 반복 개선합니다."""
+    m = len(tour)
+    improved = False
+    for i in range(m - 2):
+        if time.perf_counter() > deadline:
+            break
+        a, b = tour[i], tour[i + 1]
+        ks = np.arange(i + 2, m if i > 0 else m - 1)
+        if len(ks) == 0:
+            continue
+        c, d = tour[ks], tour[(ks + 1) % m]
+        delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+        best = int(delta.argmin())
+        if delta[best] < -_EPS:
+            k = ks[best]
+            tour[i + 1:k + 1] = tour[i + 1:k + 1][::-1]
+            improved = True
+    return improved
+
+
+def _or_opt(tour, dist, deadline, max_segment=3):
+    """1~3개 연속 구간을 다른 위치(뒤집기 포함)로 옮겨 줄어들면 적용합니다."""
+    improved = False
+    for length in range(1, max_segment + 1):
+        i = 1
+        while i + length <= len(tour):
+            if time.perf_counter() > deadline:
+                return improved
+            m = len(tour)
+            seg = tour[i:i + length]
+            prev, nxt = tour[i - 1], tour[(i + length) % m]
+            gain = dist[prev, seg[0]] + dist[seg[-1], nxt] - dist[prev, nxt]
+
+            rest = np.concatenate([tour[:i], tour[i + length:]])
+            r0, r1 = rest, np.roll(rest, -1)
+            forward = dist[r0, seg[0]] + dist[seg[-1], r1] - dist[r0, r1]
+            backward = dist[r0, seg[-1]] + dist[seg[0], r1] - dist[r0, r1]
+            insert = np.minimum(forward, backward)
+            j = int(insert.argmin())
+            if insert[j] < gain - _EPS:
+                piece = seg if forward[j] <= backward[j] else seg[::-1]
+                tour[:] = np.concatenate([rest[:j + 1], piece, rest[j + 1:]])
+                improved = True
+            i += 1
+    return improved
+
+
+def _local_search(route, dist, deadline):
+    # 시작·끝이 자유로운 경로를, 모든 곳과 거리 0인 가상 지점을 넣은 순환 경로로 바꿔 개선
+    n = len(dist)
+    padded = np.zeros((n + 1, n + 1))
+    padded[:n, :n] = dist
+    tour = np.array([n, *route])
+
+    while time.perf_counter() < deadline:
+        changed = _two_opt(tour, padded, deadline)
+        changed = _or_opt(tour, padded, deadline) or changed
+        if not changed:
+            break
+
+    cut = int(np.flatnonzero(tour == n)[0])
+    return [int(x) for x in np.concatenate([tour[cut + 1:], tour[:cut]])]
+
+
+def solve_route(dist, time_budget=TIME_BUDGET):
+    """거리 행렬로 방문 순서를 구합니다 (소규모는 정확해, 대규모는 시간 예산 안의 근사해)."""
+    n = len(dist)
+    if n <= 2:
+        return list(range(n))
+    if n <= HELD_KARP_MAX:
+        return held_karp(dist)
+
+    deadline = time.perf_counter() + time_budget
+    # 출발점이 자유로우므로 가장 바깥쪽(다른 곳과의 거리 합이 가장 큰) 장소에서 시작
+    start = int(dist.sum(axis=1).argmax())
+    return _local_search(nearest_neighbour(dist, start), dist, deadline)
+
+
+def optimize_route(indices, dist, time_budget=TIME_BUDGET):
+    """전체 거리 행렬에서 하루치 장소(indices)만 골라 방문 순서대로 정렬합니다."""
+    indices = np.asarray(indices)
+    order = solve_route(dist[np.ix_(indices, indices)], time_budget)
+    return [int(i) for i in indices[order]]
+
+
+# ===== 일자별 장소 묶기: 용량 제한 k-medoids =====
+def _capacitated_assign(to_medoids, capacity):
+    """가까운 (장소, 중심) 쌍부터 차례로, 중심마다 capacity곳까지만 배정합니다."""
+    n, k = to_medoids.shape
+    labels = np.full(n, -1)
+    load = np.zeros(k, dtype=int)
+    remaining = n
+    for flat in np.argsort(to_medoids, axis=None, kind="stable"):
+        i, c = divmod(int(flat), k)
+        if labels[i] < 0 and load[c] < capacity:
+            labels[i] = c
+            load[c] += 1
+            remaining -= 1
+            if remaining == 0:
+                break
+    return labels
+
+
+def split_days(dist, num_days, max_iter=20):
+    """장소를 num_days개의 조밀한 묶음으로 나눠 이동 순서대로 돌려줍니다 (하루 최대 ceil(n/num_days)곳)."""
+    n = len(dist)
+    k = max(1, min(num_days, n))
+    if k == 1:
+        return [list(range(n))]
+    capacity = -(-n // k)
+
+    # 서로 가장 멀리 떨어진 장소들을 초기 중심으로 (결과가 매번 같도록 결정적으로 선택)
+    medoids = [int(dist.sum(axis=1).argmax())]
+    while len(medoids) < k:
+        medoids.append(int(dist[:, medoids].min(axis=1).argmax()))
+
+    labels = None
+    for _ in range(max_iter):
+        new_labels = _capacitated_assign(dist[:, medoids], capacity)
+        if labels is not None and (new_labels == labels).all():
+            break
+        labels = new_labels
+        for c in range(k):
+            members = np.flatnonzero(labels == c)
+            if len(members):
+                # 묶음 안에서 다른 장소까지 거리 합이 가장 작은 곳이 새 중심
+                medoids[c] = int(members[dist[np.ix_(members, members)].sum(axis=1).argmin()])
+
+    # 하루하루도 서로 가까운 묶음끼리 이어지도록 중심들의 방문 순서로 정렬
+    day_order = solve_route(dist[np.ix_(medoids, medoids)])
+    return [np.flatnonzero(labels == c).tolist() for c in day_order]